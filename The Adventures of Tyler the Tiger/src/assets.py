@@ -0,0 +1,124 @@
+"""
+This module is the asset registry. Every image the game loads goes through
+here so that each file is decoded and converted only once per process.
+Converted images are also kept in the pixel cache, so later runs do not
+decode them at all.
+
+Decoding can be done ahead of time on a worker thread with prefetch();
+converting to the display format always happens in load_image(), on the
+main thread.
+"""
+import threading
+
+import pygame
+import bundle
+import pixel_cache
+
+# Converted images, keyed by (file name, alpha, background)
+_images = {}
+
+# Images read ahead of time and not yet converted, keyed like _images, as
+# returned by decode()
+_decoded = {}
+
+# Worker threads look at both dicts, so they are only changed with this
+# held
+_lock = threading.Lock()
+
+# How often the registry could reuse an image and how often it had to load
+_stats = {"hits": 0, "misses": 0}
+
+
+def decode(file_name, alpha=False, background=None):
+    """ Read an image without converting it, so this is safe on a worker
+        thread. Takes the pixels from the pixel cache when it has them.
+        Returns (image, True if the pixels came from the cache). """
+
+    image = pixel_cache.read(file_name, alpha, background)
+    if image is not None:
+        return image, True
+    return bundle.load_image(file_name), False
+
+
+def add_decoded(file_name, alpha, background, decoded):
+    """ Hand over what decode() returned, for example on a worker thread,
+        so load_image only has to convert it. """
+
+    with _lock:
+        _decoded[(file_name, alpha, background)] = decoded
+
+
+def prefetch(file_name, alpha=False, background=None):
+    """ Decode an image for a later load_image call, unless that was
+        already done. Safe on a worker thread. """
+
+    key = (file_name, alpha, background)
+    with _lock:
+        if key in _images or key in _decoded:
+            return
+    add_decoded(file_name, alpha, background,
+                decode(file_name, alpha, background))
+
+
+def load_image(file_name, alpha=False, background=None):
+    """ Load an image and convert it to the display format.
+        The first call decodes the file, or takes the converted pixels
+        from the pixel cache, and later calls return the same Surface.
+        Pass alpha=True to keep per-pixel alpha, or a background color to
+        flatten a transparent image onto that color so it can be drawn
+        with a plain opaque blit. Callers must not draw onto the returned
+        Surface since it is shared. Call this on the main thread only. """
+
+    key = (file_name, alpha, background)
+    image = _images.get(key)
+    if image is not None:
+        _stats["hits"] += 1
+        return image
+
+    _stats["misses"] += 1
+    with _lock:
+        decoded = _decoded.pop(key, None)
+    if decoded is None:
+        decoded = decode(file_name, alpha, background)
+    image, cached = decoded
+
+    if cached:
+        # Already flattened or converted once; only the copy out of the
+        # cache file into a display Surface is left
+        image = image.convert_alpha() if alpha else image.convert()
+    else:
+        if background is not None:
+            flat = pygame.Surface(image.get_size()).convert()
+            flat.fill(background)
+            flat.blit(image, (0, 0))
+            image = flat
+        elif alpha:
+            image = image.convert_alpha()
+        else:
+            image = image.convert()
+        pixel_cache.save(file_name, alpha, background, image)
+    with _lock:
+        _images[key] = image
+    return image
+
+
+def stats():
+    """ Return a copy of the hit/miss counters plus the number of images
+        currently held. """
+
+    result = dict(_stats)
+    result["images"] = len(_images)
+    return result
+
+
+def clear():
+    """ Forget every image this registry holds and reset the counters.
+        Sprites already cut out of these images are kept by
+        spritesheet_functions; call spritesheet_functions.clear() to drop
+        those as well. """
+
+    with _lock:
+        _images.clear()
+        _decoded.clear()
+    _stats["hits"] = 0
+    _stats["misses"] = 0
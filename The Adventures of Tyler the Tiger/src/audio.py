@@ -0,0 +1,140 @@
+"""
+This module plays the game's sound. Sound effects are decoded once into
+memory and played on a small pool of mixer channels; music tracks are read
+into memory once and only switched when the state of the game changes, so
+no frame ever waits on the disk.
+"""
+import pygame
+import bundle
+
+# Mixer settings. A small buffer keeps the delay between pressing jump and
+# hearing it short
+FREQUENCY = 44100
+SAMPLE_SIZE = -16
+CHANNELS = 2
+BUFFER = 512
+
+# How many sound effects can play at once
+POOL_SIZE = 8
+
+# Short effects, decoded up front
+SOUND_FILES = {
+    "jump": "jump.ogg",
+}
+
+# Music tracks and how often each one plays: -1 loops forever
+MUSIC_FILES = {
+    "rainforest": ("Deep in the Rainforest.ogg", -1),
+    "game_over": ("Game Over.ogg", 0),
+    "level_complete": ("Level Complete.ogg", 0),
+}
+
+
+def pre_init():
+    """ Ask for the mixer settings above. Has to be called before
+        pygame.init(). """
+
+    pygame.mixer.pre_init(FREQUENCY, SAMPLE_SIZE, CHANNELS, BUFFER)
+
+
+class AudioManager(object):
+    """ Owns the effects, the channel pool and the music track. Does
+        nothing if the mixer could not be started. """
+
+    def __init__(self):
+        """ Constructor. Nothing is loaded until init() is called. """
+
+        self.enabled = False
+
+        # Decoded effects, keyed by name
+        self.sounds = {}
+
+        # Music files in memory, or views onto the bundle, keyed by name
+        self.music = {}
+
+        # The channels effects are played on, and the next one to use
+        # when they are all busy
+        self.channels = []
+        self.next_channel = 0
+
+        # The music track playing right now
+        self.track = None
+
+    def init(self):
+        """ Load every effect and music file. Call once the mixer is
+            running; returns False if there is no mixer. """
+
+        if not self.start():
+            return False
+        self.load()
+        return True
+
+    def start(self):
+        """ Set up the channel pool. Returns False if there is no mixer. """
+
+        if pygame.mixer.get_init() is None:
+            return False
+
+        pygame.mixer.set_num_channels(POOL_SIZE)
+        self.channels = [pygame.mixer.Channel(i) for i in range(POOL_SIZE)]
+        return True
+
+    def load(self):
+        """ Decode the effects and read the music, then turn the sound on.
+            Only touches files and the decoder, so it can run on a worker
+            thread after start(). """
+
+        for name, file_name in SOUND_FILES.items():
+            self.sounds[name] = bundle.load_sound(file_name)
+        for name, (file_name, _) in MUSIC_FILES.items():
+            self.music[name] = bundle.read(file_name)
+
+        self.enabled = True
+
+    def channel(self):
+        """ Return a free channel from the pool, or the one that has gone
+            longest without a new sound if they are all playing. """
+
+        for channel in self.channels:
+            if not channel.get_busy():
+                return channel
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(self.channels)
+        return channel
+
+    def play_sound(self, name):
+        """ Play an effect. """
+
+        if not self.enabled:
+            return
+        self.channel().play(self.sounds[name])
+
+    def stop_sound(self, name):
+        """ Stop an effect on every channel it is playing on. """
+
+        if not self.enabled:
+            return
+        self.sounds[name].stop()
+
+    def play_music(self, name):
+        """ Switch to a music track. Does nothing if it is the track that
+            is already on, so it is safe to call every frame. """
+
+        if not self.enabled or name == self.track:
+            return
+        self.track = name
+        loops = MUSIC_FILES[name][1]
+        pygame.mixer.music.load(bundle.BufferReader(self.music[name]), "ogg")
+        pygame.mixer.music.play(loops, 0.0)
+
+    def stop_music(self):
+        """ Stop the music. """
+
+        if not self.enabled or self.track is None:
+            return
+        self.track = None
+        pygame.mixer.music.stop()
+
+
+# The audio shared by the game
+default = AudioManager()
@@ -0,0 +1,91 @@
+"""
+This module draws the scrolling background of a level. The background image
+is flattened onto the screen's fill colour once and cut into strips as wide
+as the screen, so each frame is one or two plain copies instead of a fill
+followed by a colorkeyed blit of the whole image.
+"""
+import pygame
+import assets
+import constants
+
+# How much slower than the world the background scrolls
+PARALLAX = 3
+
+# What shows where the background image does not cover the screen
+FILL = constants.WHITE
+
+# Background layers already cut into strips, keyed by file name
+_layers = {}
+
+
+class BackgroundLayer(object):
+    """ A background image in opaque strips, drawn at an x offset. Any part
+        of the screen the image does not cover is filled with the fill
+        colour, which is what showed through the old colorkey. """
+
+    def __init__(self, file_name, fill=FILL,
+                 strip_width=constants.SCREEN_WIDTH):
+        """ Constructor. Pass in the image file, the colour that was drawn
+            behind it and how wide each strip should be. """
+
+        self.fill = fill
+        self.strip_width = strip_width
+
+        image = assets.load_image(file_name, background=fill)
+        self.width, self.height = image.get_size()
+
+        # Copies, not subsurfaces, so each strip's pixels sit together
+        self.strips = []
+        for x in range(0, self.width, strip_width):
+            area = pygame.Rect(x, 0, min(strip_width, self.width - x),
+                               self.height)
+            self.strips.append(image.subsurface(area).copy())
+
+    def draw(self, screen, offset_x):
+        """ Draw the layer with its left edge at offset_x. Only the strips
+            inside the screen's clip area are drawn. """
+
+        clip = screen.get_clip()
+        covered = pygame.Rect(offset_x, 0, self.width, self.height)
+
+        # Fill whatever the image does not cover
+        if not covered.contains(clip):
+            for area in uncovered(clip, covered.clip(clip)):
+                screen.fill(self.fill, area)
+
+        first = max(0, (clip.left - offset_x) // self.strip_width)
+        last = min(len(self.strips) - 1,
+                   (clip.right - 1 - offset_x) // self.strip_width)
+        for index in range(first, last + 1):
+            screen.blit(self.strips[index],
+                        (offset_x + index * self.strip_width, 0))
+
+
+def uncovered(area, covered):
+    """ Return up to four rects that cover the part of area outside
+        covered, which has to lie inside area. """
+
+    if covered.width == 0 or covered.height == 0:
+        return [area]
+    rects = [
+        pygame.Rect(area.left, area.top, area.width,
+                    covered.top - area.top),
+        pygame.Rect(area.left, covered.bottom, area.width,
+                    area.bottom - covered.bottom),
+        pygame.Rect(area.left, covered.top, covered.left - area.left,
+                    covered.height),
+        pygame.Rect(covered.right, covered.top, area.right - covered.right,
+                    covered.height),
+    ]
+    return [rect for rect in rects if rect.width > 0 and rect.height > 0]
+
+
+def layer(file_name):
+    """ Return the background layer for an image file, building it the
+        first time. """
+
+    background = _layers.get(file_name)
+    if background is None:
+        background = BackgroundLayer(file_name)
+        _layers[file_name] = background
+    return background
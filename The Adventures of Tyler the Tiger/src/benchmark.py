@@ -0,0 +1,384 @@
+"""
+Microbenchmarks for the functions the game spends its frames in. Runs with
+no window, like the headless runner, and reports operations per second and
+how many memory blocks each operation leaves allocated.
+
+Results can be saved as a JSON baseline and later runs compared against it:
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import headless
+import pygame
+import assets
+import constants
+import levels
+import movers
+import platforms
+from player import Player
+from spritesheet_functions import SpriteSheet
+
+# Keep timing a case until it has run for at least this many seconds
+MIN_TIME = 0.2
+
+# Time each case this many times and keep the best
+REPEAT = 3
+
+# Operations run while counting allocations
+ALLOC_OPS = 100
+
+# A case this much slower than its baseline counts as a regression
+TOLERANCE = 0.10
+
+# Speed the player runs at in the collision case
+PLAYER_SPEED = 6
+
+# Every sprite the game draws: sheet, x, y, width, height, mirrored
+SPRITES = (
+    [("tiles_spritesheet.png",) + getattr(platforms, name) + (False,)
+     for name in platforms.TILE_TYPES] +
+    [("p1_walk.png", x, 96, 48, 48, flip_x)
+     for flip_x in (False, True) for x in (0, 48, 96)]
+)
+
+
+def make_screen():
+    """ Set up pygame headless with a display the size of the real game,
+        so surfaces are converted and drawn like they are in play. """
+
+    headless.init()
+    return pygame.display.set_mode(
+        [constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT]
+    )
+
+
+def make_level(level_class=levels.Level_01):
+    """ Return a player standing at the start of a newly built level. """
+
+    player = Player()
+    level = level_class(player)
+    player.level = level
+    player.rect.x = 120
+    player.rect.y = constants.SCREEN_HEIGHT - 68
+    return player, level
+
+
+# Each case sets itself up and returns the operation to time
+
+def case_get_image():
+    """ Cut a platform image out of the tile sheet. """
+
+    sheet = SpriteSheet("tiles_spritesheet.png")
+    return lambda: sheet.get_image(*platforms.STONE_PLATFORM_MIDDLE)
+
+
+def case_platform():
+    """ Build one Platform sprite. """
+
+    return lambda: platforms.Platform(platforms.STONE_PLATFORM_MIDDLE)
+
+
+def case_build_level(level_class):
+    """ Build a whole level. """
+
+    player = Player()
+    return lambda: level_class(player)
+
+
+def case_shift_world():
+    """ Scroll the world one step left or right. """
+
+    player, level = make_level()
+    shifts = itertools.cycle((-PLAYER_SPEED, PLAYER_SPEED))
+    return lambda: level.shift_world(next(shifts))
+
+
+def case_player_update():
+    """ Move the running player one frame and collide it with the level. """
+
+    player, level = make_level()
+
+    def update():
+        player.rect.x = 120
+        player.rect.y = constants.SCREEN_HEIGHT - 68
+        player.change_x = PLAYER_SPEED
+        player.change_y = 0
+        player.update()
+    return update
+
+
+def case_movers_update():
+    """ Move every moving platform and enemy of level 3 one frame, one
+        sprite at a time. """
+
+    player, level = make_level(levels.Level_03)
+    sprites = level.movers()
+
+    def update():
+        for sprite in sprites:
+            sprite.update()
+    return update
+
+
+def case_movers_engine():
+    """ Move every moving platform and enemy of level 3 one frame with the
+        NumPy engine. """
+
+    player, level = make_level(levels.Level_03)
+    engine = movers.MoverEngine(level, level.movers())
+    view = level.camera.viewport()
+    return lambda: engine.step(view)
+
+
+def case_level_draw():
+    """ Draw a level onto the whole screen. """
+
+    screen = make_screen()
+    player, level = make_level()
+    return lambda: level.draw(screen)
+
+
+def case_hud_draw():
+    """ Draw the time, score, health and lives when none of them changed. """
+
+    screen = make_screen()
+    player = Player()
+
+    def draw():
+        levels.timer(screen)
+        player.score(screen)
+        player.health(screen)
+        player.lives(screen)
+    return draw
+
+
+def case_hud_draw_changed():
+    """ Draw the score when it changed since the last frame. """
+
+    screen = make_screen()
+    player = Player()
+
+    def draw():
+        constants.SCORE += 1
+        player.score(screen)
+    return draw
+
+
+def case_blit_sprites(prepared):
+    """ Draw every sprite once, either as the sprite sheet prepares it or
+        the way sprites used to be made: a plain BLACK colorkey, without
+        RLE, flipped after the fact. """
+
+    screen = make_screen()
+    images = []
+    for file_name, x, y, width, height, flip_x in SPRITES:
+        if prepared:
+            image = SpriteSheet(file_name).get_image(x, y, width, height,
+                                                     flip_x)
+        else:
+            image = pygame.Surface([width, height]).convert()
+            image.blit(assets.load_image(file_name), (0, 0),
+                       (x, y, width, height))
+            image.set_colorkey(constants.BLACK)
+            if flip_x:
+                image = pygame.transform.flip(image, True, False)
+        images.append(image)
+    positions = [((i * 53) % 700, (i * 37) % 500) for i in range(len(images))]
+
+    def draw():
+        for image, position in zip(images, positions):
+            screen.blit(image, position)
+    return draw
+
+
+# Name, set-up function and whether the case can run here
+CASES = [
+    ("SpriteSheet.get_image", case_get_image, True),
+    ("Platform()", case_platform, True),
+    ("Level_01()", lambda: case_build_level(levels.Level_01), True),
+    ("Level_02()", lambda: case_build_level(levels.Level_02), True),
+    ("Level_03()", lambda: case_build_level(levels.Level_03), True),
+    ("Level.shift_world", case_shift_world, True),
+    ("Player.update", case_player_update, True),
+    ("MovingPlatform/Enemy.update", case_movers_update, True),
+    ("MoverEngine.step", case_movers_engine, movers.available()),
+    ("Level.draw", case_level_draw, True),
+    ("HUD draw", case_hud_draw, True),
+    ("HUD draw, text changed", case_hud_draw_changed, True),
+    ("Blit sprites, old colorkey", lambda: case_blit_sprites(False), True),
+    ("Blit sprites, prepared", lambda: case_blit_sprites(True), True),
+]
+
+
+def time_operation(operation, min_time=MIN_TIME, repeat=REPEAT):
+    """ Return the best operations per second of a few timed runs. Like
+        timeit, the garbage collector is off while timing. """
+
+    # Find a number of calls that takes about min_time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2,
+                     int(number * min_time * 1.2 / max(elapsed, 1e-9)))
+
+    best = 0.0
+    gc_was_on = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                operation()
+            elapsed = time.perf_counter() - start
+            best = max(best, number / max(elapsed, 1e-9))
+    finally:
+        if gc_was_on:
+            gc.enable()
+    return best
+
+
+def count_allocations(operation, ops=ALLOC_OPS):
+    """ Return how many memory blocks and bytes one operation leaves
+        allocated, and the most memory a run of them used at once. Only
+        memory allocated by Python is seen, not pixel data SDL owns. """
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_size = tracemalloc.get_traced_memory()[0]
+        for _ in range(ops):
+            operation()
+        peak = tracemalloc.get_traced_memory()[1] - start_size
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    return blocks / float(ops), size / float(ops), peak
+
+
+def run_cases(name_filter=None, min_time=MIN_TIME, repeat=REPEAT):
+    """ Run every case whose name contains the filter and return the
+        results, keyed by case name. """
+
+    make_screen()
+    results = {}
+    for name, setup, runnable in CASES:
+        if name_filter and name_filter.lower() not in name.lower():
+            continue
+        if not runnable:
+            print("%-28s skipped" % name)
+            continue
+
+        headless.reset_constants()
+        operation = setup()
+        ops_per_sec = time_operation(operation, min_time, repeat)
+        blocks, size, peak = count_allocations(operation)
+        results[name] = {
+            "ops_per_sec": ops_per_sec,
+            "allocs_per_op": blocks,
+            "bytes_per_op": size,
+            "peak_bytes": peak,
+        }
+        print("%-28s %12.0f ops/s %8.2f allocs/op %10.0f peak bytes" % (
+            name, ops_per_sec, blocks, peak))
+    return results
+
+
+def environment():
+    """ Describe where the benchmarks ran, to store with a baseline. """
+
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": movers.available(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """ Print how the results differ from a baseline. Returns the names of
+        the cases that got slower by more than the tolerance. """
+
+    slower = []
+    print("")
+    print("%-28s %12s %12s %8s %10s" % (
+        "case", "baseline", "now", "change", "allocs/op"))
+    for name, result in results.items():
+        old = baseline["cases"].get(name)
+        if old is None:
+            print("%-28s %12s %12.0f" % (name, "-", result["ops_per_sec"]))
+            continue
+        change = result["ops_per_sec"] / old["ops_per_sec"] - 1.0
+        note = ""
+        if change < -tolerance:
+            note = "  SLOWER"
+            slower.append(name)
+        elif change > tolerance:
+            note = "  faster"
+        print("%-28s %12.0f %12.0f %+7.1f%% %4.1f->%-4.1f%s" % (
+            name, old["ops_per_sec"], result["ops_per_sec"], change * 100,
+            old["allocs_per_op"], result["allocs_per_op"], note))
+
+    if baseline.get("environment") != environment():
+        print("note: the baseline was made with %s" % (
+            baseline.get("environment"),))
+    return slower
+
+
+def main():
+    """ Run the benchmarks, then save or compare against a baseline. """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--filter",
+                        help="only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME,
+                        help="seconds to time each case for")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help="timed runs per case; the best is kept")
+    parser.add_argument("--save", metavar="FILE",
+                        help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare the results against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown allowed before --compare fails")
+    args = parser.parse_args()
+
+    results = run_cases(args.filter, args.min_time, args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump({"environment": environment(), "cases": results},
+                      baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
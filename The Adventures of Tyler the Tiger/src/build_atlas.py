@@ -0,0 +1,155 @@
+"""
+Packs every sprite the game uses into one atlas image.
+
+Writes atlas.png and the manifest atlas.json, which maps each sprite name to
+its rect in the atlas and to where it came from. The game uses the atlas
+whenever it is newer than the sprite sheets, and the sheets otherwise, so
+run this again after changing a sheet, and then rebuild the asset bundle
+if there is one:
+    python build_atlas.py
+    python bundle.py
+"""
+import argparse
+import json
+import os
+
+import pygame
+import bundle
+import spritesheet_functions
+import platforms  # noqa: F401 (names the platform sprites)
+import player  # noqa: F401 (names the player's frames)
+
+
+def regions():
+    """ Return the distinct sprite regions as a list of
+        (sheet, rect, names), largest first. A region that lies inside
+        another one on the same sheet is packed as part of it. """
+
+    by_region = {}
+    sources = spritesheet_functions.sources()
+    for name, (sheet, rect) in sorted(sources.items()):
+        by_region.setdefault((sheet, rect), []).append(name)
+
+    ordered = sorted(by_region, key=lambda region: (
+        -region[1][2] * region[1][3], region))
+    packed = []
+    for sheet, rect in ordered:
+        names = by_region[(sheet, rect)]
+        area = pygame.Rect(rect)
+        for other_sheet, other_rect, other_names in packed:
+            if (other_sheet == sheet and
+                    pygame.Rect(other_rect).contains(area)):
+                other_names.extend(names)
+                break
+        else:
+            packed.append((sheet, rect, list(names)))
+    return packed
+
+
+def shelf_pack(sizes, width):
+    """ Place rects of the given sizes in rows no wider than width, tallest
+        first. Returns the height used and the position of each rect. """
+
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1],
+                                                     -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = row_height = 0
+    for i in order:
+        rect_width, rect_height = sizes[i]
+        if x + rect_width > width:
+            x = 0
+            y += row_height
+            row_height = 0
+        positions[i] = (x, y)
+        x += rect_width
+        row_height = max(row_height, rect_height)
+    return y + row_height, positions
+
+
+def pack(sizes):
+    """ Find the atlas width that wastes the least space. Returns
+        (width, height, positions). """
+
+    widest = max(width for width, _ in sizes)
+    total = sum(width for width, _ in sizes)
+    best = None
+    for width in range(widest, total + 1):
+        height, positions = shelf_pack(sizes, width)
+        if best is None or width * height < best[0] * best[1]:
+            best = (width, height, positions)
+    return best
+
+
+def build(image_name="atlas.png",
+          manifest_name=spritesheet_functions.ATLAS_MANIFEST):
+    """ Build the atlas and its manifest, named like the other assets.
+        Returns the manifest. """
+
+    packed = regions()
+    width, height, positions = pack([rect[2:] for _, rect, _ in packed])
+
+    # Copy the pixels as they are, alpha included, instead of blending
+    # them onto the empty atlas
+    atlas = pygame.Surface([width, height], pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    sheets = {}
+    sprites = {}
+    for (sheet, rect, names), position in zip(packed, positions):
+        if sheet not in sheets:
+            sheets[sheet] = pygame.image.load(bundle.path(sheet))
+        atlas.blit(sheets[sheet], position, rect,
+                   special_flags=pygame.BLEND_RGBA_MAX)
+
+        for name in names:
+            source = spritesheet_functions.sources()[name][1]
+            sprites[name] = {
+                "sheet": sheet,
+                "source": list(source),
+                "rect": [position[0] + source[0] - rect[0],
+                         position[1] + source[1] - rect[1],
+                         source[2], source[3]],
+            }
+
+    pygame.image.save(atlas, bundle.path(image_name))
+    manifest = {
+        "version": spritesheet_functions.ATLAS_VERSION,
+        "image": image_name,
+        "size": [width, height],
+        "sprites": sprites,
+    }
+    with open(bundle.path(manifest_name), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        manifest_file.write("\n")
+    return manifest
+
+
+def main():
+    """ Build the atlas and say how much smaller it is than the sheets. """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--image", default="atlas.png",
+                        help="the atlas image's name among the assets")
+    parser.add_argument("--manifest",
+                        default=spritesheet_functions.ATLAS_MANIFEST,
+                        help="the manifest's name among the assets")
+    args = parser.parse_args()
+
+    manifest = build(args.image, args.manifest)
+    width, height = manifest["size"]
+    sheets = set(entry["sheet"] for entry in manifest["sprites"].values())
+    sheet_pixels = 0
+    for sheet in sheets:
+        sheet_width, sheet_height = pygame.image.load(
+            bundle.path(sheet)).get_size()
+        sheet_pixels += sheet_width * sheet_height
+    print("%d sprites from %d sheets in a %dx%d atlas: %d%% of the sheets' "
+          "pixels, %d bytes on disk" % (
+              len(manifest["sprites"]), len(sheets), width, height,
+              100 * width * height // sheet_pixels,
+              os.path.getsize(bundle.path(args.image))))
+
+
+if __name__ == "__main__":
+    main()
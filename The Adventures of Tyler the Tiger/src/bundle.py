@@ -0,0 +1,303 @@
+"""
+This module finds the game's asset files. Assets are named by their path
+relative to this folder, like "jump.ogg" or "level_data/level_01.json".
+
+When there is an asset bundle (assets.bundle, made with
+"python bundle.py"), assets are read from that one file, which is
+memory-mapped: loaders get a reader over the mapped bytes instead of
+opening a file each. Without a bundle the loose files are used, found
+next to this module rather than in the working directory.
+
+The bundle remembers when each file in it was last changed. A loose file
+that was changed after that, or that is not in the bundle at all, is used
+instead of the bundle, so edits show up without rebuilding it.
+"""
+import argparse
+import io
+import mmap
+import os
+import struct
+
+import pygame
+
+# Folder the assets live in
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The bundle file, in ASSET_DIR
+BUNDLE_FILE = "assets.bundle"
+
+# Bundle header: magic, version, number of assets. Then for every asset
+# the length of its name, its offset, its size and the modification time
+# of its loose file in nanoseconds, followed by the name, and then the data
+# of all the assets
+MAGIC = b"TBDL"
+VERSION = 2
+HEADER = struct.Struct("<4sHI")
+ENTRY = struct.Struct("<HQQQ")
+
+# The open bundle: None until it has been looked for, False if there is
+# none
+_bundle = None
+
+
+class Bundle(object):
+    """ A memory-mapped asset bundle. """
+
+    def __init__(self, path):
+        """ Constructor. Pass in the bundle file. """
+
+        with open(path, "rb") as bundle_file:
+            self.map = mmap.mmap(bundle_file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s is not a bundle this version can read"
+                             % path)
+
+        # Where each asset is and when its loose file was changed:
+        # name -> (offset, size, modification time)
+        self.index = {}
+        position = HEADER.size
+        for _ in range(count):
+            name_length, offset, size, modified = ENTRY.unpack_from(
+                self.map, position)
+            position += ENTRY.size
+            name = self.map[position:position + name_length].decode("utf-8")
+            position += name_length
+            self.index[name] = (offset, size, modified)
+
+        # Whether each asset asked for so far is up to date, by name
+        self.fresh = {}
+
+    def __contains__(self, name):
+        """ True if the bundle has the asset and its loose file, if there
+            is one, was not changed since the bundle was built. Each asset
+            is only checked once. """
+
+        fresh = self.fresh.get(name)
+        if fresh is None:
+            fresh = name in self.index
+            if fresh:
+                try:
+                    modified = os.stat(path(name)).st_mtime_ns
+                    fresh = modified <= self.index[name][2]
+                except OSError:
+                    # Only in the bundle
+                    pass
+            self.fresh[name] = fresh
+        return fresh
+
+    def names(self):
+        """ Return the names of every asset in the bundle. """
+
+        return sorted(self.index)
+
+    def view(self, name):
+        """ Return the bytes of an asset as a view onto the mapped file. """
+
+        offset, size, _ = self.index[name]
+        return memoryview(self.map)[offset:offset + size]
+
+
+class BufferReader(io.RawIOBase):
+    """ A read-only file over a buffer, for loaders that want a file.
+        Reads copy straight out of the buffer, so a mapped asset is never
+        copied as a whole. """
+
+    def __init__(self, buffer):
+        """ Constructor. Pass in any bytes-like object. """
+
+        io.RawIOBase.__init__(self)
+        self.buffer = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        """ Copy the next bytes into target. """
+
+        size = min(len(target), len(self.buffer) - self.position)
+        target[:size] = self.buffer[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """ Move to a position, like a file. """
+
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+
+def path(name):
+    """ Return where the loose file for an asset is. """
+
+    return os.path.join(ASSET_DIR, *name.split("/"))
+
+
+def bundle():
+    """ Return the asset bundle, or None if the loose files are used. The
+        bundle is only opened once; one from another version is
+        ignored. """
+
+    global _bundle
+    if _bundle is None:
+        _bundle = False
+        if os.path.exists(path(BUNDLE_FILE)):
+            try:
+                _bundle = Bundle(path(BUNDLE_FILE))
+            except ValueError:
+                pass
+    return _bundle or None
+
+
+def use_loose_files():
+    """ Ignore the bundle from now on, for tools that rebuild it. """
+
+    global _bundle
+    _bundle = False
+
+
+def bundled(name):
+    """ True if an asset comes from the bundle. """
+
+    packed = bundle()
+    return packed is not None and name in packed
+
+
+def read(name):
+    """ Return the bytes of an asset: a view onto the bundle, or the
+        contents of the loose file. """
+
+    if bundled(name):
+        return bundle().view(name)
+    with open(path(name), "rb") as asset_file:
+        return asset_file.read()
+
+
+def exists(name):
+    """ True if there is such an asset, bundled or loose. """
+
+    return bundled(name) or os.path.exists(path(name))
+
+
+def list_dir(folder):
+    """ Return the names of the assets in a folder, like
+        ["level_data/level_01.json", ...]. """
+
+    prefix = folder + "/"
+    names = set()
+    packed = bundle()
+    if packed is not None:
+        names.update(
+            name for name in packed.names()
+            if name.startswith(prefix) and "/" not in name[len(prefix):]
+        )
+    if os.path.isdir(path(folder)):
+        names.update(prefix + file_name
+                     for file_name in os.listdir(path(folder)))
+    return sorted(names)
+
+
+def load_image(name):
+    """ Decode an image asset. Nothing is converted, so this is safe on a
+        worker thread. """
+
+    if bundled(name):
+        return pygame.image.load(BufferReader(bundle().view(name)), name)
+    return pygame.image.load(path(name))
+
+
+def load_sound(name):
+    """ Decode a sound effect. """
+
+    if bundled(name):
+        return pygame.mixer.Sound(file=BufferReader(bundle().view(name)))
+    return pygame.mixer.Sound(path(name))
+
+
+def asset_names():
+    """ Return every asset the game loads, from the loose files. Compiles
+        the levels on the way, so their binary caches are included. """
+
+    import audio
+    import constants
+    import level_loader
+    import screens
+    import spritesheet_functions
+    import platforms  # noqa: F401 (names the platform sprites)
+    import player  # noqa: F401 (names the player's frames)
+
+    names = set([constants.ICON_FILE])
+    names.update(screens.SCREEN_FILES.values())
+    names.update(audio.SOUND_FILES.values())
+    names.update(file_name for file_name, _ in audio.MUSIC_FILES.values())
+    names.update(
+        file_name for file_name, _ in spritesheet_functions.sources().values()
+    )
+
+    for file_name in level_loader.level_files():
+        name = level_loader.level_name(file_name)
+        names.add(name)
+        names.add(level_loader.cache_path(name))
+        names.add(level_loader.load(file_name).background)
+
+    # The atlas, if it is there and up to date
+    manifest = spritesheet_functions.ATLAS_MANIFEST
+    packed = spritesheet_functions.read_manifest(manifest)
+    if packed is not None:
+        names.add(manifest)
+        names.add(packed["image"])
+    return sorted(names)
+
+
+def build(names, bundle_path):
+    """ Write the named loose assets into a bundle file. """
+
+    encoded = [name.encode("utf-8") for name in names]
+    stats = [os.stat(path(name)) for name in names]
+
+    offset = HEADER.size + sum(ENTRY.size + len(name) for name in encoded)
+    with open(bundle_path, "wb") as bundle_file:
+        bundle_file.write(HEADER.pack(MAGIC, VERSION, len(names)))
+        for name, stat in zip(encoded, stats):
+            bundle_file.write(ENTRY.pack(len(name), offset, stat.st_size,
+                                         stat.st_mtime_ns))
+            bundle_file.write(name)
+            offset += stat.st_size
+        for name in names:
+            with open(path(name), "rb") as asset_file:
+                bundle_file.write(asset_file.read())
+
+
+def main():
+    """ Build the bundle from the loose files. """
+
+    parser = argparse.ArgumentParser(
+        description="Pack the game's assets into one bundle file."
+    )
+    parser.add_argument("--output", default=path(BUNDLE_FILE),
+                        help="where to write the bundle")
+    args = parser.parse_args()
+
+    use_loose_files()
+    names = asset_names()
+    build(names, args.output)
+    print("%d assets, %d bytes in %s" % (
+        len(names), os.path.getsize(args.output), args.output))
+
+
+if __name__ == "__main__":
+    # Run it from the imported module, whose state the game modules share
+    import bundle
+    bundle.main()
@@ -0,0 +1,58 @@
+"""
+This module holds the Camera class. Every sprite in a level keeps its
+position in world coordinates; the camera decides which part of the world
+is on screen and turns world positions into screen positions when drawing.
+"""
+import pygame
+import constants
+
+
+class Camera(object):
+    """ A horizontally scrolling view onto a level. """
+
+    def __init__(self, width=constants.SCREEN_WIDTH,
+                 height=constants.SCREEN_HEIGHT):
+        """ Constructor. Pass in the size of the view. """
+
+        self.width = width
+        self.height = height
+
+        # How far the world has been scrolled; negative is to the right
+        self.offset_x = 0
+
+    def scroll(self, shift_x):
+        """ Scroll the view. Costs the same however big the level is. """
+
+        self.offset_x += shift_x
+
+    def reset(self):
+        """ Go back to the start of the level. """
+
+        self.offset_x = 0
+
+    def to_screen_x(self, x):
+        """ Turn a world x coordinate into a screen x coordinate. """
+
+        return x + self.offset_x
+
+    def to_world_x(self, x):
+        """ Turn a screen x coordinate into a world x coordinate. """
+
+        return x - self.offset_x
+
+    def apply(self, rect):
+        """ Return a copy of a world rect moved to where it is on screen. """
+
+        return rect.move(self.offset_x, 0)
+
+    def to_world_rect(self, rect):
+        """ Return a copy of a screen rect moved to where it is in the
+            world. """
+
+        return rect.move(-self.offset_x, 0)
+
+    def viewport(self):
+        """ Return the part of the world that is on screen, as a rect in
+            world coordinates. """
+
+        return pygame.Rect(-self.offset_x, 0, self.width, self.height)
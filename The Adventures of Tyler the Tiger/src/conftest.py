@@ -0,0 +1,25 @@
+"""
+Shared set-up for the tests. Importing headless switches SDL to its dummy
+drivers, so no window or audio device is opened, and every test starts
+from a new game's session values.
+
+Run the tests from this folder with:
+    python -m pytest -q
+"""
+import pytest
+
+import headless
+import constants
+
+
+@pytest.fixture(autouse=True)
+def new_session():
+    """ Give every test a dummy display and the values a new game starts
+        with, and put back the switches a test may have turned. """
+
+    headless.init()
+    headless.reset_constants()
+    vector_movers = constants.VECTOR_MOVERS
+    yield
+    constants.VECTOR_MOVERS = vector_movers
+    headless.reset_constants()
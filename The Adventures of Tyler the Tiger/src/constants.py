@@ -13,6 +13,9 @@ GRAY = (128, 128, 128)
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 
+# Window icon
+ICON_FILE = "icon.png"
+
 # Game attributes
 LIVES = 3
 HEALTH = 100
@@ -22,3 +25,10 @@ GAME_OVER = False
 GAME_START = False
 VICTORY = False
 HELP_SCREEN = False
+
+# Rendering options
+# Only redraw and update the parts of the screen that changed
+DIRTY_RECTS = False
+
+# Move all the moving platforms and enemies at once with NumPy
+VECTOR_MOVERS = False
@@ -0,0 +1,120 @@
+"""
+This module holds the dirty-rectangle renderer. Instead of redrawing and
+flipping the whole screen every frame it only redraws the areas that
+changed and hands those to pygame.display.update.
+"""
+import pygame
+import hud
+
+
+class DirtyRectRenderer(object):
+    """ Tracks the sprites that can move and the HUD fields, and redraws
+        only the screen areas they touched since the last frame. This
+        pays off while the camera stands still. When it moves, the
+        background scrolls at its own speed under the world, so every
+        pixel changes and the whole screen is redrawn and flipped. """
+
+    def __init__(self):
+        """ Constructor. The first frame is always drawn in full. """
+
+        self.full_redraw = True
+        self.level = None
+        self.world_shift = None
+
+        # Sprites that can move on the current level
+        self.movers = []
+
+        # Where each tracked sprite was drawn: sprite -> (rect, image)
+        self.drawn = {}
+
+        # Number of pixels pushed to the display on the last frame
+        self.pixels = 0
+
+    def invalidate(self):
+        """ Make the next frame redraw the whole screen, for example after
+            a menu screen was shown. """
+
+        self.full_redraw = True
+
+    def track_level(self, level):
+        """ Remember which sprites of a new level can move. """
+
+        self.level = level
+        self.movers = level.movers()
+        self.full_redraw = True
+
+    def draw(self, screen, level, sprites, draw_frame):
+        """ Draw a frame and return the list of rects that changed.
+            draw_frame(screen) must draw the whole frame; it is called
+            once, with the screen clipped to the area that changed. """
+
+        if level is not self.level:
+            self.track_level(level)
+
+        # A camera move changes every pixel
+        if level.world_shift != self.world_shift:
+            self.full_redraw = True
+
+        tracked = list(self.movers)
+        tracked.extend(sprites)
+
+        if self.full_redraw:
+            draw_frame(screen)
+            hud.default.take_dirty()
+            rects = [screen.get_rect()]
+        else:
+            # Run the HUD once without touching any pixels so it can tell
+            # us which fields changed
+            screen.set_clip(pygame.Rect(0, 0, 0, 0))
+            draw_frame(screen)
+            screen.set_clip(None)
+
+            rects = self.moved_rects(tracked, level.camera)
+            rects.extend(hud.default.take_dirty())
+            rects = merge_rects(rects, screen.get_rect())
+            if rects:
+                screen.set_clip(rects[0].unionall(rects[1:]))
+                draw_frame(screen)
+                screen.set_clip(None)
+
+        camera = level.camera
+        self.drawn = dict(
+            (sprite, (camera.apply(sprite.rect), sprite.image))
+            for sprite in tracked
+        )
+        self.full_redraw = False
+        self.world_shift = level.world_shift
+        self.pixels = sum(rect.width * rect.height for rect in rects)
+        return rects
+
+    def moved_rects(self, sprites, camera):
+        """ Return the old and new screen areas of every sprite that moved
+            or changed its image since the last frame. """
+
+        rects = []
+        for sprite in sprites:
+            rect = camera.apply(sprite.rect)
+            drawn = self.drawn.get(sprite)
+            if drawn is None:
+                rects.append(rect)
+            elif drawn[0] != rect or drawn[1] is not sprite.image:
+                rects.append(drawn[0].union(rect))
+        return rects
+
+
+def merge_rects(rects, bounds):
+    """ Clip the rects to bounds and merge the ones that overlap, so no
+        area is drawn twice. """
+
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        # Keep growing the rect while it overlaps one we already have
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -0,0 +1,356 @@
+"""
+A Gym-style environment around the game, for level tuning and automated
+play-testing. TylerEnv plays one life of a level with no window: reset()
+starts an episode, step(action) plays one frame and returns
+(observation, reward, done, info). VectorEnv runs many of them spread over
+worker processes and returns their observations as one NumPy array.
+
+Needs NumPy. Example, which prints how many frames a second it manages:
+    python env.py --envs 16 --workers 4 --steps 2000
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+import headless
+import numpy
+import pygame
+import constants
+from game import Game
+
+# The actions: which arrow keys are held down during the frame
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+JUMP = 3
+LEFT_JUMP = 4
+RIGHT_JUMP = 5
+ACTION_KEYS = (
+    (),
+    (pygame.K_LEFT,),
+    (pygame.K_RIGHT,),
+    (pygame.K_UP,),
+    (pygame.K_LEFT, pygame.K_UP),
+    (pygame.K_RIGHT, pygame.K_UP),
+)
+
+# How many of the closest enemies the observation describes
+NEAREST_ENEMIES = 3
+
+# What an observation holds, in order. Enemy positions are relative to the
+# player; a missing enemy is FAR away
+OBSERVATION_FIELDS = (
+    ("level", "x", "y", "change_x", "change_y", "world_shift",
+     "health", "time", "score") +
+    tuple("enemy_%d_%s" % (i, axis)
+          for i in range(NEAREST_ENEMIES) for axis in ("dx", "dy"))
+)
+OBSERVATION_SIZE = len(OBSERVATION_FIELDS)
+FAR = 10000.0
+
+# Reward for finishing the last level, and for losing the life
+WIN_REWARD = 1000.0
+LOSE_REWARD = -1000.0
+
+# The values in constants that belong to one session of the game
+SESSION = ("TIME", "HEALTH", "LIVES", "SCORE")
+
+
+class TylerEnv(object):
+    """ One life of the game as an environment. The reward is how far right
+        the player got this frame, plus WIN_REWARD or LOSE_REWARD when the
+        episode ends.
+
+        The game keeps its time, health, lives and score in constants, which
+        every game in the process shares. Each environment keeps its own
+        copy and swaps it in while it runs, so any number of them can take
+        turns in one process. """
+
+    def __init__(self, level_no=0, fps=headless.FPS):
+        """ Constructor. Pass in the index of the level to play and how
+            many frames make up one second of the countdown. """
+
+        headless.init()
+        self.level_no = level_no
+        self.fps = fps
+        self.session = self.new_session()
+        self.game = None
+        self.held = ()
+        self.frame = 0
+
+        # Where the player was after the last frame: level and world x
+        self.last_level = level_no
+        self.last_x = 0
+
+    @staticmethod
+    def new_session():
+        """ Return the session values a new game starts with. """
+
+        return {"TIME": 100, "HEALTH": 100, "LIVES": 3, "SCORE": 0}
+
+    def swap_in(self):
+        """ Put this environment's session values into constants. """
+
+        for name in SESSION:
+            setattr(constants, name, self.session[name])
+
+    def swap_out(self):
+        """ Take this environment's session values back out of
+            constants. """
+
+        for name in SESSION:
+            self.session[name] = getattr(constants, name)
+
+    def reset(self):
+        """ Start a new episode and return the first observation. The game
+            is built the first time; after that the level is only reset. """
+
+        self.session = self.new_session()
+        self.swap_in()
+        if self.game is None:
+            self.game = Game(audio=False, first_level=self.level_no,
+                             prefetch=False)
+        else:
+            self.game.restart()
+            self.swap_in()
+        self.game.game_start = True
+        self.held = ()
+        self.frame = 0
+        self.last_level = self.game.current_level_no
+        self.last_x = self.game.player.rect.x
+        self.swap_out()
+        return self.observe()
+
+    def press(self, action):
+        """ Turn an action into the key events the game would get. Arrow
+            keys are pressed when an action starts holding them and let go
+            when it stops; jumping presses up again every frame. """
+
+        keys = ACTION_KEYS[action]
+        game = self.game
+        for key in self.held:
+            if key not in keys:
+                game.handle_event(pygame.event.Event(pygame.KEYUP, key=key))
+        for key in keys:
+            if key == pygame.K_UP or key not in self.held:
+                game.handle_event(pygame.event.Event(pygame.KEYDOWN,
+                                                     key=key))
+        self.held = keys
+
+    def step(self, action):
+        """ Play one frame with the given action held down. Returns
+            (observation, reward, done, info). """
+
+        game = self.game
+        self.swap_in()
+        self.press(action)
+        self.frame += 1
+        if self.frame % self.fps == 0:
+            game.countdown()
+        game.update()
+
+        # A new level starts the count again from its left edge
+        level_no = game.current_level_no
+        player_x = game.player.rect.x
+        reward = 0.0
+        if level_no == self.last_level:
+            reward = float(player_x - self.last_x)
+        self.last_level = level_no
+        self.last_x = player_x
+
+        done = game.game_over
+        outcome = None
+        if done:
+            outcome = "victory" if game.victory else "lost"
+            reward += WIN_REWARD if game.victory else LOSE_REWARD
+        self.swap_out()
+
+        info = {"frame": self.frame, "level": level_no, "outcome": outcome}
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        """ Return the observation of the current frame as a float32 array
+            laid out like OBSERVATION_FIELDS. """
+
+        game = self.game
+        player = game.player
+        level = game.current_level
+        session = self.session
+        values = [
+            game.current_level_no, player.rect.x, player.rect.y,
+            player.change_x, player.change_y, level.world_shift,
+            session["HEALTH"], session["TIME"], session["SCORE"],
+        ]
+
+        centre = player.rect.center
+        enemies = sorted(
+            (abs(enemy.rect.centerx - centre[0]),
+             enemy.rect.centerx - centre[0], enemy.rect.centery - centre[1])
+            for enemy in level.enemy_list
+        )[:NEAREST_ENEMIES]
+        for _, dx, dy in enemies:
+            values.extend((dx, dy))
+        values.extend([FAR] * (OBSERVATION_SIZE - len(values)))
+        return numpy.array(values, dtype=numpy.float32)
+
+    def render(self):
+        """ Draw the frame and return it as an RGB array of shape
+            (height, width, 3). """
+
+        self.swap_in()
+        screen = pygame.Surface(
+            [constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT]
+        )
+        self.game.draw_playing(screen)
+        self.swap_out()
+        return pygame.surfarray.array3d(screen).swapaxes(0, 1)
+
+
+def worker(connection, level_numbers):
+    """ Run a shard of environments in a worker process and answer
+        commands from the parent: ("reset", None), ("step", actions) and
+        ("close", None). Finished episodes are reset straight away; the
+        observation they ended with goes back in their info. """
+
+    envs = [TylerEnv(level_no) for level_no in level_numbers]
+    observations = numpy.zeros((len(envs), OBSERVATION_SIZE),
+                               dtype=numpy.float32)
+    rewards = numpy.zeros(len(envs), dtype=numpy.float32)
+    dones = numpy.zeros(len(envs), dtype=bool)
+
+    while True:
+        command, data = connection.recv()
+        if command == "reset":
+            for i, env in enumerate(envs):
+                observations[i] = env.reset()
+            connection.send(observations)
+        elif command == "step":
+            infos = []
+            for i, env in enumerate(envs):
+                observation, reward, done, info = env.step(data[i])
+                if done:
+                    info["final_observation"] = observation
+                    observation = env.reset()
+                observations[i] = observation
+                rewards[i] = reward
+                dones[i] = done
+                infos.append(info)
+            connection.send((observations, rewards, dones, infos))
+        elif command == "close":
+            connection.close()
+            return
+
+
+class VectorEnv(object):
+    """ Many TylerEnvs split into shards, one shard per worker process.
+        step() takes one action per environment and returns batched NumPy
+        arrays. Each worker steps its whole shard per message, so the
+        processes spend their time playing rather than talking. """
+
+    def __init__(self, num_envs, level_no=0, workers=None):
+        """ Constructor. Pass in how many environments to run, the level
+            they play (one index, or one per environment) and how many
+            worker processes to use; the default is one per CPU. """
+
+        if isinstance(level_no, int):
+            level_no = [level_no] * num_envs
+        workers = min(num_envs, workers or os.cpu_count() or 1)
+        self.num_envs = num_envs
+
+        # Spawned, not forked: a fresh interpreter per worker never shares
+        # SDL state or the level prefetch thread with the parent
+        context = multiprocessing.get_context("spawn")
+        bounds = [num_envs * i // workers for i in range(workers + 1)]
+        self.shards = []
+        self.connections = []
+        self.processes = []
+        for start, stop in zip(bounds, bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=worker, args=(child, level_no[start:stop]),
+                daemon=True
+            )
+            process.start()
+            child.close()
+            self.shards.append(slice(start, stop))
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def reset(self):
+        """ Reset every environment. Returns observations of shape
+            (num_envs, OBSERVATION_SIZE). """
+
+        for connection in self.connections:
+            connection.send(("reset", None))
+        return numpy.concatenate(
+            [connection.recv() for connection in self.connections]
+        )
+
+    def step(self, actions):
+        """ Step every environment with its action. Returns
+            (observations, rewards, dones, infos); environments that finish
+            start their next episode right away. """
+
+        actions = numpy.asarray(actions)
+        for connection, shard in zip(self.connections, self.shards):
+            connection.send(("step", actions[shard].tolist()))
+
+        results = [connection.recv() for connection in self.connections]
+        observations = numpy.concatenate([result[0] for result in results])
+        rewards = numpy.concatenate([result[1] for result in results])
+        dones = numpy.concatenate([result[2] for result in results])
+        infos = [info for result in results for info in result[3]]
+        return observations, rewards, dones, infos
+
+    def close(self):
+        """ Stop the worker processes. """
+
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+        self.connections = []
+        self.processes = []
+
+
+def main():
+    """ Play random actions in parallel and print the throughput. """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--envs", type=int, default=8,
+                        help="number of environments")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--level", type=int, default=1,
+                        help="level to play, from 1")
+    parser.add_argument("--steps", type=int, default=1000,
+                        help="steps to take in every environment")
+    args = parser.parse_args()
+
+    envs = VectorEnv(args.envs, args.level - 1, args.workers)
+    rng = numpy.random.default_rng(0)
+    try:
+        envs.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            actions = rng.integers(0, len(ACTION_KEYS), size=args.envs)
+            _, _, dones, _ = envs.step(actions)
+            episodes += int(dones.sum())
+        elapsed = time.perf_counter() - start
+    finally:
+        envs.close()
+
+    frames = args.steps * args.envs
+    print("%d frames, %d episodes in %.2fs: %.0f frames/s" % (
+        frames, episodes, elapsed, frames / max(elapsed, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+This module holds the Game class. The Game keeps the state of one play
+session and steps it one frame at a time, so it can be driven by the
+window in platform_scroller or by the headless runner.
+"""
+import pygame
+import audio
+import constants
+import dirty
+import levels
+from level_queue import LevelQueue
+from profiler import FrameProfiler
+from player import Player
+
+# The levels in the order they are played
+LEVEL_CLASSES = [levels.Level_01, levels.Level_02, levels.Level_03]
+
+
+class Game(object):
+    """ One session of the game: the player, the levels and the state
+        flags the main loop used to keep in local variables. """
+
+    def __init__(self, audio=True, first_level=0, prefetch=True):
+        """ Constructor. Pass audio=False when there is no mixer, the
+            index of the level to start on and whether to prepare the next
+            level in the background. """
+
+        self.audio = audio
+        self.first_level = first_level
+
+        # Creates an instance of the player
+        self.player = Player()
+
+        # Game attribute variables
+        self.game_over = False
+        self.victory = False
+        self.game_start = False
+        self.help_screen = False
+
+        # Levels are built when they are reached; the next one is
+        # prepared in the background
+        self.levels = LevelQueue(LEVEL_CLASSES, self.player, prefetch)
+
+        # Set the current level
+        self.current_level_no = first_level
+        self.current_level = self.levels.get(self.current_level_no)
+
+        self.active_sprite_list = pygame.sprite.Group()
+        self.place_player()
+        self.active_sprite_list.add(self.player)
+
+        # Used to redraw only what changed when DIRTY_RECTS is on
+        self.renderer = dirty.DirtyRectRenderer()
+
+        # Times the phases of every frame; off unless the main loop swaps
+        # in one that is enabled
+        self.profiler = FrameProfiler()
+
+    def place_player(self):
+        """ Sets the player at the start of the current level. """
+
+        self.player.level = self.current_level
+        self.player.rect.x = 120
+        self.player.rect.y = constants.SCREEN_HEIGHT - 68
+        self.player.lose_jump = constants.SCREEN_HEIGHT - 67
+
+    def restart(self):
+        """ Start again from the first level after losing a life. The
+            player and the level are put back the way they started;
+            nothing is loaded or built again. """
+
+        constants.TIME = 100  # Reset time
+        constants.LIVES = constants.LIVES - 1  # Subtract a life
+        constants.HEALTH = 100
+
+        self.game_over = False
+        self.victory = False
+        self.game_start = False
+        self.help_screen = False
+
+        self.current_level_no = self.first_level
+        self.current_level = self.levels.get(self.current_level_no)
+        self.player.reset()
+        self.place_player()
+        self.renderer.invalidate()
+
+    def can_restart(self):
+        """ True if a click on the game over screen starts over, False if
+            it closes the game. """
+
+        return self.victory is not True and constants.LIVES > 1
+
+    def update_music(self):
+        """ Play the music that goes with the state of the game. The track
+            only changes when the state does. """
+
+        if not self.audio:
+            return
+        if self.game_over is not True:
+            audio.default.play_music("rainforest")
+        elif self.victory is True:
+            audio.default.play_music("level_complete")
+        else:
+            audio.default.play_music("game_over")
+
+    def countdown(self):
+        """ Called once a second to count the timer down. """
+
+        if self.game_start is True:
+            if constants.TIME > 0:
+                if self.victory is True:
+                    constants.TIME = constants.TIME
+                else:
+                    constants.TIME -= 1
+
+    def handle_event(self, event):
+        """ React to the keyboard. """
+
+        player = self.player
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_h and self.game_start is False:
+                self.help_screen = True
+            if event.key == pygame.K_ESCAPE and self.game_start is False:
+                self.help_screen = False
+            if event.key == pygame.K_SPACE and self.game_start is False:
+                self.game_start = True
+            player_x = self.current_level.camera.to_screen_x(player.rect.x)
+            if event.key == pygame.K_LEFT and player_x > 120:
+                player.go_left()
+            if event.key == pygame.K_RIGHT and player_x > 0:
+                player.go_right()
+            if (event.key == pygame.K_UP and
+               player.rect.y < player.lose_jump):
+                player.jump()  # Player is above the platform
+                if self.audio:
+                    audio.default.play_sound("jump")
+                    if self.game_over is True:
+                        audio.default.stop_sound("jump")
+
+        if event.type == pygame.KEYUP:
+            if event.key == pygame.K_LEFT and player.change_x < 0:
+                player.stop()
+            if event.key == pygame.K_RIGHT and player.change_x > 0:
+                player.stop()
+
+    def update(self):
+        """ Move everything one frame and check for the end of the level
+            or the game. """
+
+        player = self.player
+        profiler = self.profiler
+
+        # Update the player
+        self.active_sprite_list.update()
+        profiler.mark("player")
+
+        # Update items in the level
+        self.current_level.update()
+        profiler.mark("level")
+
+        # The player lives in world coordinates; the camera decides where
+        # on screen that is
+        camera = self.current_level.camera
+
+        # If the player gets near the right side, shift the world left (-x)
+        player_x = camera.to_screen_x(player.rect.x)
+        if player_x >= 500:
+            diff = player_x - 500
+            self.current_level.shift_world(-diff)
+
+        # If the player gets near the left side, do not shift the world
+        if camera.to_screen_x(player.rect.x) <= 120:
+            player.rect.x = camera.to_world_x(120)
+            self.current_level.shift_world(0)
+        profiler.mark("scroll")
+
+        # If the player gets to the last level, end the game
+        current_position = (
+            camera.to_screen_x(player.rect.x) +
+            self.current_level.world_shift
+        )
+        if current_position < self.current_level.level_limit:
+            if self.current_level_no == len(self.levels)-1:
+                self.game_over = True
+                self.victory = True
+                constants.TIME = constants.TIME
+
+        # If the player gets to the end of the level, go to the next level
+            if self.current_level_no < len(self.levels)-1:
+                self.current_level_no += 1
+                self.current_level = self.levels.get(self.current_level_no)
+                player.level = self.current_level
+                player.rect.x = self.current_level.camera.to_world_x(120)
+                if constants.HEALTH == 100:
+                    constants.SCORE = 500
+                else:
+                    constants.SCORE = constants.HEALTH*5
+
+        # If the player falls while time remains, end game and reset time
+        if player.rect.y == 650 and constants.TIME >= 0:
+            self.game_over = True
+            constants.TIME = 0
+
+        # If the time runs out, end the game and reset the time
+        if constants.TIME == 0:
+            self.game_over = True
+
+        if constants.HEALTH == 0:
+            self.game_over = True
+
+        # Change the music if the game just ended
+        self.update_music()
+        profiler.mark("state")
+
+    def draw_playing(self, screen):
+        """ Draw one frame of gameplay. """
+
+        self.current_level.draw(screen)
+        self.current_level.draw_sprites(screen, self.active_sprite_list)
+        self.profiler.mark("draw")
+        levels.timer(screen)
+        self.player.lives(screen)
+        self.player.health(screen)
+        self.player.score(screen)
+        self.profiler.mark("hud")
+
+    def draw(self, screen):
+        """ Draw the current frame. Returns the list of rects that changed,
+            or None if the whole screen needs to be flipped. """
+
+        player = self.player
+        if self.game_start is True:  # Draw game
+            if self.game_over is True:  # Game ended
+                self.renderer.invalidate()
+                if self.victory is True:
+                    player.winner_screen(screen)  # Draw the winner screen
+                else:
+                    player.game_over(screen)  # Draw the game over screen
+            elif constants.DIRTY_RECTS is True:
+                return self.renderer.draw(
+                    screen, self.current_level, self.active_sprite_list,
+                    self.draw_playing
+                )
+            else:
+                self.draw_playing(screen)
+        elif self.help_screen is True:
+            self.renderer.invalidate()
+            player.help(screen)
+        else:
+            self.renderer.invalidate()
+            player.title_screen(screen)
+        self.profiler.mark("draw")
+        return None
@@ -0,0 +1,129 @@
+"""
+Headless runner. Steps the game logic with no window, no sound and no frame
+cap, so whole levels can be played far faster than real time for balance
+testing and CI.
+
+Example:
+    python headless.py --level 2 --runs 100
+"""
+import argparse
+import os
+import time
+
+# Use SDL's dummy drivers so no window or audio device is opened. This has
+# to happen before pygame sets up its display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+import constants  # noqa: E402
+from game import Game  # noqa: E402
+
+# Simulated frames per second; one countdown tick every FPS frames
+FPS = 60
+
+# Frames after which a run is given up
+MAX_FRAMES = FPS * (constants.TIME + 10)
+
+
+def init():
+    """ Set up pygame with a dummy display. Images still have to be
+        converted to a display format, so a display is needed. """
+
+    pygame.display.init()
+    pygame.font.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode([1, 1])
+
+
+def reset_constants():
+    """ Put the session values back to how a new game starts. """
+
+    constants.TIME = 100
+    constants.HEALTH = 100
+    constants.LIVES = 3
+    constants.SCORE = 0
+
+
+def run_right(game, frame):
+    """ Default policy: keep running right and jump every half second. """
+
+    events = []
+    if game.player.change_x <= 0:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT))
+    if frame % 30 == 0:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP))
+    return events
+
+
+def run(policy=run_right, level_no=0, max_frames=MAX_FRAMES):
+    """ Play one life of a level and return a dict with the outcome.
+        policy(game, frame) returns the events to feed in on each frame.
+        Time only moves with simulated frames, never with the wall clock. """
+
+    init()
+    reset_constants()
+    game = Game(audio=False, first_level=level_no, prefetch=False)
+    game.game_start = True
+
+    frame = 0
+    while frame < max_frames and not game.game_over:
+        frame += 1
+        for event in policy(game, frame):
+            game.handle_event(event)
+        if frame % FPS == 0:
+            game.countdown()
+        game.update()
+
+    if game.victory:
+        outcome = "victory"
+    elif game.game_over:
+        outcome = "lost"
+    else:
+        outcome = "unfinished"
+
+    return {
+        "outcome": outcome,
+        "frames": frame,
+        "level": game.current_level_no,
+        "x": game.player.rect.x,
+        "y": game.player.rect.y,
+        "time": constants.TIME,
+        "health": constants.HEALTH,
+        "score": constants.SCORE,
+    }
+
+
+def main():
+    """ Run a level a number of times and print how it went. """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("--level", type=int, default=1,
+                        help="level to start on, from 1")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="how many times to play it")
+    parser.add_argument("--max-frames", type=int, default=MAX_FRAMES,
+                        help="give up after this many frames")
+    parser.add_argument("--vector-movers", action="store_true",
+                        help="move platforms and enemies with NumPy")
+    args = parser.parse_args()
+    constants.VECTOR_MOVERS = args.vector_movers
+
+    frames = 0
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        result = run(level_no=args.level - 1, max_frames=args.max_frames)
+        frames += result["frames"]
+        print(result)
+    elapsed = time.perf_counter() - start
+
+    simulated = frames / float(FPS)
+    print("%d frames (%.1fs of play) in %.2fs, %.0fx real time" % (
+        frames, simulated, elapsed, simulated / max(elapsed, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
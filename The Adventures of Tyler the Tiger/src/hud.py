@@ -0,0 +1,118 @@
+"""
+This module draws the heads-up display: the outlined time, score, health
+and lives text along the top of the screen.
+"""
+from collections import OrderedDict
+
+import pygame
+import constants
+
+# Font used for the HUD
+FONT_NAME = "serif"
+FONT_SIZE = 36
+
+# How many outlined text surfaces to keep around
+CACHE_SIZE = 64
+
+
+class HUD(object):
+    """ Renders outlined text once and keeps the result until the text
+        changes. Fonts are only created the first time they are needed. """
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        """ Constructor. Pass in how many rendered texts to remember. """
+
+        self.cache_size = cache_size
+
+        # Fonts, keyed by size
+        self.fonts = {}
+
+        # Outlined text surfaces, keyed by (size, text), oldest first
+        self.cache = OrderedDict()
+
+        # What each field shows right now: name -> (text, surface, rect)
+        self.fields = {}
+
+        # Screen areas of fields whose text changed, keyed by field name
+        self.dirty = {}
+
+        # Number of times a text actually had to be rendered
+        self.renders = 0
+
+    def font(self, size):
+        """ Return the HUD font in the given size. """
+
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.SysFont(FONT_NAME, size)
+            self.fonts[size] = font
+        return font
+
+    def render_outlined(self, text, size=FONT_SIZE):
+        """ Return a surface with the text in orange and a one pixel black
+            outline around it. The text itself starts at (1, 1). """
+
+        key = (size, text)
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            return image
+
+        font = self.font(size)
+        inner = font.render(text, True, constants.TIGER_ORANGE)
+        outline = font.render(text, True, constants.BLACK)
+
+        width, height = inner.get_size()
+        image = pygame.Surface([width + 2, height + 2], pygame.SRCALPHA)
+        image.blit(outline, [0, 0])
+        image.blit(outline, [0, 2])
+        image.blit(outline, [2, 0])
+        image.blit(outline, [2, 2])
+        image.blit(inner, [1, 1])
+        self.renders += 1
+
+        self.cache[key] = image
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return image
+
+    def set_field(self, name, text, pos_x, pos_y, size=FONT_SIZE):
+        """ Set the text of a named HUD field starting at pos_x, pos_y and
+            return its (surface, rect). The text is only rendered again
+            when it changes, and then the area is marked as dirty. """
+
+        field = self.fields.get(name)
+        if field is None or field[0] != text:
+            image = self.render_outlined(text, size)
+            rect = image.get_rect(topleft=(pos_x - 1, pos_y - 1))
+
+            # Both the old and the new text area need to be redrawn
+            dirty = rect
+            if field is not None:
+                dirty = dirty.union(field[2])
+            if name in self.dirty:
+                dirty = dirty.union(self.dirty[name])
+            self.dirty[name] = dirty
+
+            field = (text, image, rect)
+            self.fields[name] = field
+        return field[1], field[2]
+
+    def draw_field(self, screen, name, text, pos_x, pos_y, size=FONT_SIZE):
+        """ Draw a named HUD field with its text starting at pos_x, pos_y.
+            The text is only rendered again when it changes. """
+
+        image, rect = self.set_field(name, text, pos_x, pos_y, size)
+        screen.blit(image, rect)
+
+    def take_dirty(self):
+        """ Return the screen areas of fields that changed since the last
+            call and forget them. """
+
+        rects = list(self.dirty.values())
+        self.dirty.clear()
+        return rects
+
+
+# The HUD shared by the game
+default = HUD()
@@ -0,0 +1,228 @@
+"""
+This module reads level descriptions from the JSON files in level_data.
+
+A level file lists the background, the level limit, the static platforms
+as [type, x, y] and the moving platforms and enemies with their movement
+bounds and speed. The first time a file is read it is compiled into a
+compact binary cache next to it (level_01.json -> level_01.lvc), which is
+read instead as long as it is newer than the JSON file and was written
+with the same table of tile types. An asset bundle holds the compiled
+levels, which are then read straight from it.
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+import bundle
+import platforms
+
+# Folder with the level files
+LEVEL_DIR = "level_data"
+
+# Cache file header: magic, version, hash of the tile type table, level
+# limit, background name length, number of static platforms, number of
+# movers
+CACHE_MAGIC = b"TLVL"
+CACHE_VERSION = 2
+CACHE_HEADER = struct.Struct("<4sHIiHII")
+
+# The cache stores tile types as indexes into platforms.TILE_TYPES, so a
+# cache written with another table would load the wrong tiles
+TILE_TABLE = zlib.crc32("\n".join(platforms.TILE_TYPES).encode("ascii"))
+
+# What a mover is
+MOVING_PLATFORM = 0
+ENEMY = 1
+
+# The fields stored for every mover, in cache order
+MOVER_FIELDS = ("kind", "type", "x", "y", "boundary_left", "boundary_right",
+                "boundary_top", "boundary_bottom", "change_x", "change_y")
+
+
+class LevelData(object):
+    """ A level description held in flat arrays. Tiles are stored as
+        parallel arrays of tile type ids and coordinates, movers as one
+        array with len(MOVER_FIELDS) numbers per mover. """
+
+    def __init__(self, background, level_limit):
+        """ Constructor. Pass in the background file and level limit. """
+
+        self.background = background
+        self.level_limit = level_limit
+        self.tile_types = array("h")
+        self.tile_x = array("i")
+        self.tile_y = array("i")
+        self.movers = array("i")
+
+    def tiles(self):
+        """ Yield (tile type name, x, y) for every static platform. """
+
+        names = platforms.TILE_TYPES
+        for type_id, x, y in zip(self.tile_types, self.tile_x, self.tile_y):
+            yield names[type_id], x, y
+
+    def mover_rows(self):
+        """ Yield a dict with MOVER_FIELDS for every mover. The tile type
+            is given by name. """
+
+        size = len(MOVER_FIELDS)
+        for start in range(0, len(self.movers), size):
+            row = dict(zip(MOVER_FIELDS, self.movers[start:start + size]))
+            row["type"] = platforms.TILE_TYPES[row["type"]]
+            yield row
+
+
+def level_name(file_name):
+    """ Return the asset name of a level file. """
+
+    return LEVEL_DIR + "/" + file_name
+
+
+def cache_path(path):
+    """ Return the path of the binary cache for a level file. """
+
+    return os.path.splitext(path)[0] + ".lvc"
+
+
+def level_files():
+    """ Return the file names of all the level files. """
+
+    return [name.split("/")[-1] for name in bundle.list_dir(LEVEL_DIR)
+            if name.endswith(".json")]
+
+
+def parse(path):
+    """ Read a JSON level file into a LevelData. """
+
+    with open(path) as level_file:
+        return from_source(json.load(level_file))
+
+
+def from_source(source):
+    """ Turn the contents of a JSON level file into a LevelData. """
+
+    data = LevelData(source["background"], source["level_limit"])
+    type_ids = dict((name, i) for i, name in enumerate(platforms.TILE_TYPES))
+
+    for name, x, y in source["platforms"]:
+        data.tile_types.append(type_ids[name])
+        data.tile_x.append(x)
+        data.tile_y.append(y)
+
+    movers = [(MOVING_PLATFORM, entry)
+              for entry in source.get("moving_platforms", [])]
+    movers.extend((ENEMY, entry) for entry in source.get("enemies", []))
+    for kind, entry in movers:
+        row = dict(entry)
+        row["kind"] = kind
+        row["type"] = type_ids[entry["type"]]
+        data.movers.extend(row.get(field, 0) for field in MOVER_FIELDS)
+
+    return data
+
+
+def little_endian(numbers):
+    """ Return the array in little-endian byte order. """
+
+    if sys.byteorder == "big":
+        numbers = array(numbers.typecode, numbers)
+        numbers.byteswap()
+    return numbers
+
+
+def write_cache(data, path):
+    """ Write a LevelData to a binary cache file. """
+
+    background = data.background.encode("utf-8")
+    with open(path, "wb") as cache_file:
+        cache_file.write(CACHE_HEADER.pack(
+            CACHE_MAGIC, CACHE_VERSION, TILE_TABLE, data.level_limit,
+            len(background), len(data.tile_types),
+            len(data.movers) // len(MOVER_FIELDS)
+        ))
+        cache_file.write(background)
+        for numbers in (data.tile_types, data.tile_x, data.tile_y,
+                        data.movers):
+            little_endian(numbers).tofile(cache_file)
+
+
+def read_cache(path):
+    """ Read a binary cache file back into a LevelData. Returns None if
+        the file is not a cache this version understands or was written
+        with another table of tile types. """
+
+    with open(path, "rb") as cache_file:
+        return unpack_cache(cache_file.read())
+
+
+def unpack_cache(buffer):
+    """ Turn the bytes of a binary cache into a LevelData. Returns None if
+        they are not a cache this version understands or were written with
+        another table of tile types. """
+
+    if len(buffer) < CACHE_HEADER.size:
+        return None
+    (magic, version, tile_table, level_limit, name_length, tiles,
+     movers) = CACHE_HEADER.unpack_from(buffer)
+    if (magic != CACHE_MAGIC or version != CACHE_VERSION
+            or tile_table != TILE_TABLE):
+        return None
+
+    position = CACHE_HEADER.size
+    background = bytes(buffer[position:position + name_length])
+    position += name_length
+    data = LevelData(background.decode("utf-8"), level_limit)
+    for numbers, count in ((data.tile_types, tiles),
+                           (data.tile_x, tiles),
+                           (data.tile_y, tiles),
+                           (data.movers, movers * len(MOVER_FIELDS))):
+        size = count * numbers.itemsize
+        if position + size > len(buffer):
+            return None
+        numbers.frombytes(buffer[position:position + size])
+        position += size
+
+    if sys.byteorder == "big":
+        for numbers in (data.tile_types, data.tile_x, data.tile_y,
+                        data.movers):
+            numbers.byteswap()
+    return data
+
+
+def load(file_name):
+    """ Return the LevelData for a level file in LEVEL_DIR. Uses the
+        bundle if it has the level. Otherwise uses the binary cache when it
+        is newer than the JSON file, or parses the JSON and writes a new
+        cache. """
+
+    name = level_name(file_name)
+    if bundle.bundled(name):
+        # The compiled level is only good while the JSON file is
+        if bundle.bundled(cache_path(name)):
+            data = unpack_cache(bundle.read(cache_path(name)))
+            if data is not None:
+                return data
+        return from_source(json.loads(bytes(bundle.read(name))))
+
+    path = bundle.path(name)
+    cached = cache_path(path)
+
+    try:
+        fresh = os.path.getmtime(cached) >= os.path.getmtime(path)
+    except OSError:
+        fresh = False
+    if fresh:
+        data = read_cache(cached)
+        if data is not None:
+            return data
+
+    data = parse(path)
+    try:
+        write_cache(data, cached)
+    except OSError:
+        # The cache is only a speed-up; carry on without it
+        pass
+    return data
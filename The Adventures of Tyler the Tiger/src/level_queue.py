@@ -0,0 +1,100 @@
+"""
+This module builds levels when they are needed instead of all at once, and
+prepares the next level on a background thread while the current one is
+being played. The thread only does the file work: it reads the level file
+and decodes the background image. Converting images for the display and
+building the sprites is left to the main thread.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import assets
+import background
+import level_loader
+
+# One worker is enough: only the next level is ever prepared
+_executor = None
+
+
+def executor():
+    """ Return the shared background worker, creating it on first use. """
+
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="level-prefetch"
+        )
+    return _executor
+
+
+class LevelQueue(object):
+    """ Hands out levels by number. Only the first level, the level being
+        played and the one after it are ever held, so memory does not grow
+        with the number of levels. """
+
+    def __init__(self, level_classes, player, prefetch=True):
+        """ Constructor. Pass in the level classes in play order, the
+            player and whether to build the next level in the background. """
+
+        self.level_classes = level_classes
+        self.player = player
+        self.prefetch = prefetch
+
+        # The level being prepared: (level number, future)
+        self.pending = None
+
+        # The level restarts go back to: (level number, level)
+        self.kept = None
+
+    def __len__(self):
+        """ The number of levels. """
+
+        return len(self.level_classes)
+
+    def prepare(self, level_no):
+        """ Read a level's file and decode its background. Runs on the
+            worker thread, so nothing is converted for the display here.
+            Returns the level's LevelData, or None if it has no file. """
+
+        level_file = self.level_classes[level_no].level_file
+        if level_file is None:
+            return None
+        data = level_loader.load(level_file)
+        assets.prefetch(data.background, background=background.FILL)
+        return data
+
+    def build(self, level_no, data=None):
+        """ Build a level right now, from its LevelData if that was
+            already read. Only call this on the main thread. """
+
+        return self.level_classes[level_no](self.player, data)
+
+    def get(self, level_no):
+        """ Return a level ready to play and start preparing the level
+            after it. The first level handed out is kept, and reset instead
+            of built again when it is asked for a second time. """
+
+        level = None
+        if self.kept is not None and self.kept[0] == level_no:
+            level = self.kept[1]
+            level.reset()
+
+        next_no = level_no + 1
+        if self.pending is not None:
+            pending_no, future = self.pending
+            if level is None and pending_no == level_no:
+                # Usually done already; otherwise wait for it to finish
+                level = self.build(level_no, future.result())
+                self.pending = None
+            elif pending_no != next_no:
+                future.cancel()
+                self.pending = None
+
+        if level is None:
+            level = self.build(level_no)
+        if self.kept is None:
+            self.kept = (level_no, level)
+
+        if (self.prefetch and self.pending is None and
+           next_no < len(self.level_classes)):
+            self.pending = (next_no, executor().submit(self.prepare, next_no))
+        return level
@@ -4,8 +4,17 @@ the player interacts with.
 """
 
 import pygame
+import background
 import constants
+import hud
+import level_loader
+import movers
 import platforms
+from camera import Camera
+from spatial import SpatialHash
+
+# Sprites this far outside the screen are still drawn
+DRAW_MARGIN = 64
 
 
 class Level():
@@ -17,569 +26,245 @@ class Level():
     platform_list = None
     enemy_list = None
 
-    # Background image
+    # The platforms that never move, as a platforms.TileLayer
+    tiles = None
+
+    # Background image, as a background.BackgroundLayer
     background = None
 
-    # How far this world has been scrolled horizontally
-    world_shift = 0
+    # The file in level_data this level is built from
+    level_file = None
+
+    # The view onto this level
+    camera = None
     level_limit = -1000
 
-    def __init__(self, player):
+    # How many sprites the last draw call drew and how many it skipped
+    drawn_sprites = 0
+    culled_sprites = 0
+
+    def __init__(self, player, data=None):
         """
         Constructor. Pass in a handle to player.
         Needed for when moving platforms collide with the player.
+        Pass in the level_loader.LevelData if it was already read;
+        otherwise level_file is read.
         """
         self.platform_list = pygame.sprite.Group()
         self.enemy_list = pygame.sprite.Group()
+        self.tiles = platforms.TileLayer()
         self.player = player
+        self.camera = Camera()
+
+        # What the player can collide with, sorted by where it is in the
+        # world: merged runs of static tiles and the moving platforms
+        self.platform_index = SpatialHash()
+
+        # Where everything that moves starts out, taken by save_state()
+        self.initial_state = []
+
+        # Moves all the movers at once when VECTOR_MOVERS is on
+        self.mover_engine = None
+
+        if self.level_file is not None:
+            if data is None:
+                data = level_loader.load(self.level_file)
+            self.load(data)
+
+    def add_platform(self, platform):
+        """ Add a moving platform to the level. """
+
+        self.platform_list.add(platform)
+        self.platform_index.insert(platform)
+
+    def add_tile(self, tile_type, x, y):
+        """ Add a platform that never moves to the level. Call
+            merge_tiles() once all the tiles are in. """
+
+        self.tiles.add(tile_type, x, y)
+
+    def merge_tiles(self):
+        """ Build the collision shapes for the static tiles. Tiles side by
+            side at the same height become one span, so the player has far
+            fewer rects to check. """
+
+        for span in platforms.merge_tiles(self.tiles.rects()):
+            self.platform_index.insert(span)
+
+    def load(self, data):
+        """ Build the level from a level_loader.LevelData. """
+
+        self.background = background.layer(data.background)
+        self.level_limit = data.level_limit
+
+        # Go through the static platforms and add them
+        for tile_type, x, y in data.tiles():
+            self.add_tile(tile_type, x, y)
+        self.merge_tiles()
+
+        # Add the moving platforms and the enemies
+        for row in data.mover_rows():
+            if row["kind"] == level_loader.ENEMY:
+                block = platforms.Enemy(getattr(platforms, row["type"]))
+            else:
+                block = platforms.MovingPlatform(
+                    getattr(platforms, row["type"])
+                )
+            block.rect.x = row["x"]
+            block.rect.y = row["y"]
+            block.boundary_left = row["boundary_left"]
+            block.boundary_right = row["boundary_right"]
+            block.boundary_top = row["boundary_top"]
+            block.boundary_bottom = row["boundary_bottom"]
+            block.change_x = row["change_x"]
+            block.change_y = row["change_y"]
+            block.player = self.player
+            block.level = self
+            if row["kind"] == level_loader.ENEMY:
+                self.enemy_list.add(block)
+            else:
+                self.add_platform(block)
+
+        self.save_state()
+        if movers.use_engine():
+            self.mover_engine = movers.MoverEngine(self, self.movers())
+
+    def save_state(self):
+        """ Remember where every moving platform and enemy is and how it
+            is moving, so reset() can put them back. """
+
+        self.initial_state = [
+            (sprite, sprite.rect.topleft, sprite.change_x, sprite.change_y)
+            for sprite in self.movers()
+        ]
+
+    def reset(self):
+        """ Put the level back the way it was when it was built, without
+            building it again. """
+
+        self.camera.reset()
+        for sprite, topleft, change_x, change_y in self.initial_state:
+            sprite.rect.topleft = topleft
+            sprite.change_x = change_x
+            sprite.change_y = change_y
+            if sprite in self.platform_index.entries:
+                self.platform_index.update(sprite)
+        if self.mover_engine is not None:
+            self.mover_engine.load()
+
+    def movers(self):
+        """ Return the moving platforms and enemies. """
+
+        sprites = [
+            sprite for sprite in self.platform_list
+            if isinstance(sprite, platforms.MovingPlatform)
+        ]
+        sprites.extend(self.enemy_list)
+        return sprites
+
+    def collide_platforms(self, sprite):
+        """ Return the platforms a sprite touches. Only looks at the
+            platforms near it. """
+
+        return self.platform_index.collide(sprite.rect)
+
+    @property
+    def world_shift(self):
+        """ How far this world has been scrolled horizontally. """
+
+        return self.camera.offset_x
+
+    @property
+    def background_x(self):
+        """ Where the background is drawn; it scrolls slower than the
+            world. """
+
+        return self.world_shift // background.PARALLAX
 
     # Update everything on this level
     def update(self):
         """ Update everything in this level. """
 
-        self.platform_list.update()
-        self.enemy_list.update()
+        if self.mover_engine is not None:
+            self.mover_engine.step(self.camera.viewport())
+        else:
+            self.platform_list.update()
+            self.enemy_list.update()
 
     def draw(self, screen):
         """ Draw everything on this level. """
 
         # Draw and shift the background
-        screen.fill(constants.WHITE)
-        screen.blit(self.background, (self.world_shift // 3, 0))
-
-        # Draw all the sprite lists that we have
-        self.platform_list.draw(screen)
-        self.enemy_list.draw(screen)
+        self.background.draw(screen, self.background_x)
+
+        # Only draw the sprites that can be seen: the part of the screen
+        # we are allowed to draw on, plus a margin, in world coordinates
+        view = self.camera.to_world_rect(screen.get_clip())
+        view.inflate_ip(DRAW_MARGIN * 2, DRAW_MARGIN * 2)
+
+        # The movers are few, so a plain scan finds them. Culling stays out
+        # of platform_index, whose query counts measure collision work
+        tile_blits = self.tiles.blits(view, self.camera.offset_x)
+        platform_list = [
+            platform for platform in self.platform_list
+            if view.colliderect(platform.rect)
+        ]
+        enemy_list = [
+            enemy for enemy in self.enemy_list
+            if view.colliderect(enemy.rect)
+        ]
+
+        # Draw the tiles and all the sprite lists that we have
+        screen.blits(tile_blits, False)
+        self.draw_sprites(screen, platform_list)
+        self.draw_sprites(screen, enemy_list)
+
+        self.drawn_sprites = (
+            len(tile_blits) + len(platform_list) + len(enemy_list)
+        )
+        self.culled_sprites = (
+            len(self.tiles) + len(self.platform_list) +
+            len(self.enemy_list) - self.drawn_sprites
+        )
 
-    def shift_world(self, shift_x):
-        """ When the user moves left/right, we need to scroll everything: """
+    def draw_sprites(self, screen, sprites):
+        """ Draw sprites that live in this level where the camera sees
+            them. """
 
-        # Keep track of the shift amount
-        self.world_shift += shift_x
+        offset = (self.camera.offset_x, 0)
+        for sprite in sprites:
+            screen.blit(sprite.image, sprite.rect.move(offset))
 
-        # Go through all the sprite lists and shift
-        for platform in self.platform_list:
-            platform.rect.x += shift_x
+    def shift_world(self, shift_x):
+        """ When the user moves left/right, we need to scroll everything.
+            Sprites stay where they are in the world; only the camera
+            moves. """
 
-        for enemy in self.enemy_list:
-            enemy.rect.x += shift_x
+        self.camera.scroll(shift_x)
 
 
 class Level_01(Level):
     """ Definition for Level 1. """
 
-    def __init__(self, player):
-        """ Create Level 1. """
-
-        # Call the parent constructor
-        Level.__init__(self, player)
-
-        self.background = pygame.image.load("background_01.png").convert()
-        self.background.set_colorkey(constants.WHITE)
-        self.level_limit = -2500
-
-        # Array with type of platform, and x, y location of the platform
-        level = [[platforms.SMALL_GRASS_MIDDLE, 0,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 70,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 140,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 210,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 280,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 350,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 420,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 1680,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 1750,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 1820,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 1890,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 2170,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 2240,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 2310,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 2380,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 2940,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3010,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3080,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3430,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3500,
-                  constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 500, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 570, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 710, 450],
-                 [platforms.SMALL_GRASS_MIDDLE, 940, 400],
-                 [platforms.SMALL_GRASS_MIDDLE, 1070, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1140, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1280, 400],
-                 [platforms.SMALL_GRASS_MIDDLE, 1460, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 1740, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1810, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1960, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 2000, 200],
-                 [platforms.SMALL_GRASS_MIDDLE, 2250, 250],
-                 [platforms.SMALL_GRASS_MIDDLE, 2500, 125],
-                 [platforms.SMALL_GRASS_MIDDLE, 2570, 550],
-                 [platforms.SMALL_GRASS_MIDDLE, 2710, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 2630, 275],
-                 [platforms.SMALL_GRASS_MIDDLE, 2850, 375],
-                 [platforms.SMALL_GRASS_MIDDLE, 3150, 400],
-                 [platforms.SMALL_GRASS_MIDDLE, 3220, 400],
-                 [platforms.SMALL_GRASS_MIDDLE, 3290, 400],
-                 ]
-
-        # Go through the array above and add platforms
-        for platform in level:
-            block = platforms.Platform(platform[0])
-            block.rect.x = platform[1]
-            block.rect.y = platform[2]
-            block.player = self.player
-            self.platform_list.add(block)
-
-        # Add an enemy to the level
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 260
-        block.rect.y = constants.SCREEN_HEIGHT - 110
-        block.boundary_right = 340
-        block.boundary_left = 180
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 1700
-        block.rect.y = constants.SCREEN_HEIGHT - 110
-        block.boundary_right = 1850
-        block.boundary_left = 1700
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 2250
-        block.rect.y = constants.SCREEN_HEIGHT - 110
-        block.boundary_right = 2350
-        block.boundary_left = 2250
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 3170
-        block.rect.y = 310
-        block.boundary_right = 3270
-        block.boundary_left = 3170
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        # Add a custom moving platform
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 1350
-        block.rect.y = 300
-        block.boundary_left = 1350
-        block.boundary_right = 1600
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 950
-        block.rect.y = 500
-        block.boundary_left = 950
-        block.boundary_right = 1200
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2020
-        block.rect.y = 400
-        block.boundary_left = 2020
-        block.boundary_right = 2300
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
+    level_file = "level_01.json"
 
 
 class Level_02(Level):
     """ Definition for Level 2. """
 
-    def __init__(self, player):
-        """ Create Level 2. """
-
-        # Call the parent constructor
-        Level.__init__(self, player)
-
-        self.background = pygame.image.load("background_02.png").convert()
-        self.background.set_colorkey(constants.WHITE)
-        self.level_limit = -2500
-
-        # Array with type of platform, and x, y location of the platform.
-        level = [[platforms.SMALL_GRASS_MIDDLE, 0,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 70,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 140,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 210,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 280,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 350,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 420,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 2940,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3010,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3080,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3430,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3500,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3570,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 650, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 720, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 1070, 200],
-                 [platforms.SMALL_GRASS_MIDDLE, 1140, 200],
-                 [platforms.SMALL_GRASS_MIDDLE, 1210, 200],
-                 [platforms.SMALL_GRASS_MIDDLE, 1280, 200],
-                 [platforms.SMALL_GRASS_MIDDLE, 1740, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1810, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1880, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1950, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 2450, 500],
-                 [platforms.SMALL_GRASS_MIDDLE, 2690, 550],
-                 [platforms.SMALL_GRASS_MIDDLE, 3150, 450],
-                 [platforms.SMALL_GRASS_MIDDLE, 3220, 450],
-                 [platforms.SMALL_GRASS_MIDDLE, 3290, 450],
-                 ]
-
-        # Go through the array above and add platforms
-        for platform in level:
-            block = platforms.Platform(platform[0])
-            block.rect.x = platform[1]
-            block.rect.y = platform[2]
-            block.player = self.player
-            self.platform_list.add(block)
-
-        # Add a custom moving platform
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 1500
-        block.rect.y = 300
-        block.boundary_top = 100
-        block.boundary_bottom = 500
-        block.change_y = -1
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 800
-        block.rect.y = 300
-        block.boundary_top = 100
-        block.boundary_bottom = 500
-        block.change_y = 1
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2250
-        block.rect.y = 300
-        block.boundary_top = 100
-        block.boundary_bottom = 500
-        block.change_y = 1
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        # Add an enemy to the level
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 1100
-        block.rect.y = 110
-        block.boundary_right = 1200
-        block.boundary_left = 1100
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 1900
-        block.rect.y = 210
-        block.boundary_right = 1900
-        block.boundary_left = 1800
-        block.change_x = -1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 2960
-        block.rect.y = constants.SCREEN_HEIGHT - 110
-        block.boundary_right = 3060
-        block.boundary_left = 2960
-        block.change_x = -1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 260
-        block.rect.y = constants.SCREEN_HEIGHT - 110
-        block.boundary_right = 340
-        block.boundary_left = 180
-        block.change_x = 1
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
+    level_file = "level_02.json"
 
 
 class Level_03(Level):
     """ Definition for Level 3. """
 
-    def __init__(self, player):
-        """ Create Level 3. """
-
-        # Call the parent constructor
-        Level.__init__(self, player)
-
-        self.background = pygame.image.load("background_03.png").convert()
-        self.background.set_colorkey(constants.WHITE)
-        self.level_limit = -2500
-
-        # Array with type of platform, and x, y location of the platform
-        level = [[platforms.SMALL_GRASS_MIDDLE, 0,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 70,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 140,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 210,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 280,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3290,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3470,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 3540,
-                 constants.SCREEN_HEIGHT - 20],
-                 [platforms.SMALL_GRASS_MIDDLE, 1200, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1270, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1340, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1410, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1480, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1550, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 1620, 300],
-                 [platforms.SMALL_GRASS_MIDDLE, 3000, 475],
-                 [platforms.SMALL_GRASS_MIDDLE, 3070, 475],
-                 [platforms.SMALL_GRASS_MIDDLE, 3140, 475],
-                 [platforms.SMALL_GRASS_MIDDLE, 3210, 475],
-                 ]
-
-        # Go through the array above and add platforms
-        for platform in level:
-            block = platforms.Platform(platform[0])
-            block.rect.x = platform[1]
-            block.rect.y = platform[2]
-            block.player = self.player
-            self.platform_list.add(block)
-
-        # Add a custom moving platform
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 350
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 450
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = 5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 550
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 650
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = 5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 750
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 850
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = 5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 950
-        block.rect.y = 450
-        block.boundary_top = 100
-        block.boundary_bottom = 550
-        block.change_y = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        # Add an enemy to the level
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 1320
-        block.rect.y = 210
-        block.boundary_right = 1480
-        block.boundary_left = 1320
-        block.change_x = 5
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 1700
-        block.rect.y = 400
-        block.boundary_left = 1700
-        block.boundary_right = 1900
-        block.change_x = 5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2100
-        block.rect.y = 400
-        block.boundary_left = 1900
-        block.boundary_right = 2100
-        block.change_x = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2100
-        block.rect.y = 400
-        block.boundary_left = 2100
-        block.boundary_right = 2300
-        block.change_x = 5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2500
-        block.rect.y = 400
-        block.boundary_left = 2300
-        block.boundary_right = 2500
-        block.change_x = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2500
-        block.rect.y = 400
-        block.boundary_left = 2500
-        block.boundary_right = 2700
-        block.change_x = 5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.MovingPlatform(platforms.STONE_PLATFORM_MIDDLE)
-        block.rect.x = 2900
-        block.rect.y = 400
-        block.boundary_left = 2700
-        block.boundary_right = 2900
-        block.change_x = -5
-        block.player = self.player
-        block.level = self
-        self.platform_list.add(block)
-
-        block = platforms.Enemy(platforms.ENEMY_PLATFORM)
-        block.rect.x = 3160
-        block.rect.y = 385
-        block.boundary_right = 3160
-        block.boundary_left = 3060
-        block.change_x = -5
-        block.player = self.player
-        block.level = self
-        self.enemy_list.add(block)
+    level_file = "level_03.json"
 
 
 def timer(screen):
     """ Method to be called for displaying the time on the screen. """
 
     if constants.GAME_OVER is False:
-        font = pygame.font.SysFont("serif", 36)
-        text = font.render(
-            "Time: " + str(constants.TIME), True, constants.TIGER_ORANGE
-        )
-        outline = font.render(
-            "Time: " + str(constants.TIME), True, constants.BLACK
+        hud.default.draw_field(
+            screen, "time", "Time: " + str(constants.TIME), 10, 10
         )
-        pos_x = 10
-        pos_y = 10
-        screen.blit(outline, [pos_x - 1, pos_y - 1])
-        screen.blit(outline, [pos_x - 1, pos_y + 1])
-        screen.blit(outline, [pos_x + 1, pos_y - 1])
-        screen.blit(outline, [pos_x + 1, pos_y + 1])
-        screen.blit(text, [pos_x, pos_y])
@@ -0,0 +1,155 @@
+"""
+This module holds an optional engine that moves all the moving platforms and
+enemies of a level at once with NumPy, instead of calling update() on every
+sprite. It needs NumPy; available() tells whether it can be used.
+"""
+import constants
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Movers this far outside the screen still get their sprite rects updated
+SYNC_MARGIN = 128
+
+
+def available():
+    """ Return True if NumPy is installed. """
+
+    return numpy is not None
+
+
+class MoverEngine(object):
+    """ Keeps the positions, speeds and bounds of a level's movers in
+        arrays and advances them all in one step.
+
+        The arrays are the real positions. Sprite rects are only written
+        for movers near the screen, since nothing else looks at them.
+        Each step assumes the movers do not touch the player. From the
+        first mover that does, the engine runs the sprites' own update()
+        in order, so the result is exactly what the sprites would do. """
+
+    def __init__(self, level, sprites):
+        """ Constructor. Pass in the level and its movers in update order. """
+
+        self.level = level
+        self.sprites = list(sprites)
+        self.load()
+
+    def load(self):
+        """ Read the state of every mover from its sprite. """
+
+        sprites = self.sprites
+        self.x = numpy.array([s.rect.x for s in sprites], dtype=numpy.int64)
+        self.y = numpy.array([s.rect.y for s in sprites], dtype=numpy.int64)
+        self.width = numpy.array([s.rect.width for s in sprites],
+                                 dtype=numpy.int64)
+        self.height = numpy.array([s.rect.height for s in sprites],
+                                  dtype=numpy.int64)
+        self.change_x = numpy.array([s.change_x for s in sprites],
+                                    dtype=numpy.int64)
+        self.change_y = numpy.array([s.change_y for s in sprites],
+                                    dtype=numpy.int64)
+        self.boundary_left = numpy.array([s.boundary_left for s in sprites],
+                                         dtype=numpy.int64)
+        self.boundary_right = numpy.array(
+            [s.boundary_right for s in sprites], dtype=numpy.int64
+        )
+        self.boundary_top = numpy.array([s.boundary_top for s in sprites],
+                                        dtype=numpy.int64)
+        self.boundary_bottom = numpy.array(
+            [s.boundary_bottom for s in sprites], dtype=numpy.int64
+        )
+
+        # Where the sprite rects are, which can lag behind off screen
+        self.sprite_x = self.x.copy()
+        self.sprite_y = self.y.copy()
+
+    def touching(self, x, y, rect):
+        """ Return which movers at x, y overlap a rect, like
+            Rect.colliderect. """
+
+        return ((x < rect.right) & (x + self.width > rect.left) &
+                (y < rect.bottom) & (y + self.height > rect.top))
+
+    def step(self, view):
+        """ Move everything one frame, then update the sprite rects of the
+            movers inside the view (a world rect). """
+
+        if not self.sprites:
+            return
+
+        player_rect = self.level.player.rect
+
+        # Move left/right, then up/down, as if nobody hits the player
+        x = self.x + self.change_x
+        y = self.y + self.change_y
+        hits = self.touching(x, self.y, player_rect)
+        hits |= self.touching(x, y, player_rect)
+
+        # Check the boundaries and see if we need to reverse direction
+        flip_y = (y + self.height > self.boundary_bottom) | (
+            y < self.boundary_top)
+        flip_x = (x < self.boundary_left) | (x > self.boundary_right)
+
+        # Everything before the first hit is exactly right
+        first_hit = len(self.sprites)
+        if hits.any():
+            first_hit = int(numpy.argmax(hits))
+        done = slice(0, first_hit)
+        self.x[done] = x[done]
+        self.y[done] = y[done]
+        self.change_x[done] = numpy.where(
+            flip_x[done], -self.change_x[done], self.change_x[done])
+        self.change_y[done] = numpy.where(
+            flip_y[done], -self.change_y[done], self.change_y[done])
+
+        # From there on the player may have been shoved, so let the
+        # sprites do it themselves, one at a time
+        for index in range(first_hit, len(self.sprites)):
+            sprite = self.sprites[index]
+            self.write(index, sprite)
+            sprite.update()
+            self.x[index] = sprite.rect.x
+            self.y[index] = sprite.rect.y
+            self.change_x[index] = sprite.change_x
+            self.change_y[index] = sprite.change_y
+
+        self.sync(view)
+
+    def write(self, index, sprite):
+        """ Copy the state of one mover to its sprite. """
+
+        sprite.rect.x = self.sprite_x[index] = int(self.x[index])
+        sprite.rect.y = self.sprite_y[index] = int(self.y[index])
+        sprite.change_x = int(self.change_x[index])
+        sprite.change_y = int(self.change_y[index])
+
+    def sync(self, view=None):
+        """ Update the sprite rects of the movers inside a world rect, plus
+            a margin, or of every mover if no rect is given. A sprite whose
+            old rect is still inside is updated too, so it can never be
+            drawn where it no longer is. """
+
+        if view is None:
+            visible = range(len(self.sprites))
+        else:
+            view = view.inflate(SYNC_MARGIN * 2, SYNC_MARGIN * 2)
+            visible = numpy.flatnonzero(
+                self.touching(self.x, self.y, view) |
+                self.touching(self.sprite_x, self.sprite_y, view)
+            )
+
+        index_entries = self.level.platform_index.entries
+        for index in visible:
+            sprite = self.sprites[index]
+            self.write(index, sprite)
+            if sprite in index_entries:
+                self.level.platform_index.update(sprite)
+
+
+def use_engine():
+    """ Return True if levels should move their movers with the engine. """
+
+    return constants.VECTOR_MOVERS is True and available()
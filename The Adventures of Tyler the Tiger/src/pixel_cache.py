@@ -0,0 +1,173 @@
+"""
+This module keeps the game's images on disk already decoded and converted,
+so a warm start does not have to inflate any PNGs.
+
+Each converted image is written as raw pixels in the display's own layout
+to a file in pixel_cache/. The file is named after two hashes: one of
+everything that decides the pixels besides the source file (the file's
+name, the display's pixel format, whether alpha is kept and the
+background colour) and one of the source file's bytes. Editing an image
+or changing the display format therefore never picks up old pixels; it
+just misses the cache. A hit maps the raw file into memory and builds the
+Surface over it with pygame.image.frombuffer; assets.load_image then
+converts it for the display.
+
+Writing a new version of an image deletes the older ones, and the least
+recently used files are deleted while the cache is over CACHE_LIMIT.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import pygame
+import bundle
+
+# Folder the raw pixel files go in
+CACHE_DIR = os.path.join(bundle.ASSET_DIR, "pixel_cache")
+
+# Most bytes the cache may take up on disk
+CACHE_LIMIT = 64 * 1024 * 1024
+
+# Raw file header: magic, version, width, height and the byte order of
+# each pixel as a pygame.image.frombuffer format. The pixels follow
+MAGIC = b"TPIX"
+VERSION = 1
+HEADER = struct.Struct("<4sHII4s")
+
+# frombuffer formats for 32 bit surfaces, by their red, green and blue
+# masks. Surfaces in any other format are not cached
+FORMATS = {
+    (0xff0000, 0xff00, 0xff): "BGRA",
+    (0xff, 0xff00, 0xff0000): "RGBA",
+}
+
+# Hashes of the source files, keyed by asset name, so each file is only
+# hashed once. Worker threads use it too, hence the lock
+_hashes = {}
+_hashes_lock = threading.Lock()
+
+
+def pixel_format():
+    """ Return the frombuffer format that matches the display's pixels,
+        or None if there is no display or its format cannot be cached. """
+
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_bitsize() != 32:
+        return None
+    name = FORMATS.get(tuple(screen.get_masks()[:3]))
+    if name is None or sys.byteorder != "little":
+        return None
+    return name
+
+
+def source_hash(file_name):
+    """ Return the hash of an image asset's bytes. """
+
+    with _hashes_lock:
+        digest = _hashes.get(file_name)
+    if digest is None:
+        digest = hashlib.sha1(bundle.read(file_name)).hexdigest()
+        with _hashes_lock:
+            _hashes[file_name] = digest
+    return digest
+
+
+def cache_path(file_name, alpha=False, background=None):
+    """ Return the raw file an image would be cached in, or None if the
+        image cannot be cached. Same arguments as assets.load_image. """
+
+    name = pixel_format()
+    if name is None:
+        return None
+    screen = pygame.display.get_surface()
+    slot = "%s %s %s %s %s" % (file_name, name, screen.get_masks(), alpha,
+                               tuple(background) if background else None)
+    slot = hashlib.sha1(slot.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR,
+                        "%s-%s.raw" % (slot, source_hash(file_name)))
+
+
+def read(file_name, alpha=False, background=None):
+    """ Return an image from the cache as a Surface over the mapped file,
+        or None if it is not there. Nothing is converted, so this is safe
+        on a worker thread; the mapping stays open until the Surface is
+        freed, which is normally right after it has been converted. """
+
+    path = cache_path(file_name, alpha, background)
+    if path is None:
+        return None
+    try:
+        with open(path, "rb") as raw_file:
+            pixels = mmap.mmap(raw_file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        # Mark it as used, so it is among the last to be evicted
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+
+    if len(pixels) < HEADER.size:
+        pixels.close()
+        return None
+    magic, version, width, height, name = HEADER.unpack_from(pixels)
+    if (magic != MAGIC or version != VERSION
+            or len(pixels) != HEADER.size + width * height * 4):
+        pixels.close()
+        return None
+    return pygame.image.frombuffer(memoryview(pixels)[HEADER.size:],
+                                   (width, height), name.decode("ascii"))
+
+
+def save(file_name, alpha, background, image):
+    """ Write a converted image to the cache. Does nothing if it cannot be
+        cached. """
+
+    path = cache_path(file_name, alpha, background)
+    if path is None:
+        return
+    name = pixel_format()
+    width, height = image.get_size()
+
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        # Write to a temporary file first so a half-written file is never
+        # picked up
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as raw_file:
+            raw_file.write(HEADER.pack(MAGIC, VERSION, width, height,
+                                       name.encode("ascii")))
+            raw_file.write(pygame.image.tobytes(image, name))
+        os.replace(temporary, path)
+        evict(path)
+    except OSError:
+        # The cache is only a speed-up; carry on without it
+        pass
+
+
+def evict(kept):
+    """ Delete the other versions of the image that was just written to
+        the file kept, then the least recently used files until the cache
+        fits in CACHE_LIMIT. """
+
+    slot = os.path.basename(kept).split("-")[0]
+    files = []
+    for file_name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, file_name)
+        if path == kept or not file_name.endswith(".raw"):
+            continue
+        if file_name.startswith(slot + "-"):
+            os.remove(path)
+        else:
+            stat = os.stat(path)
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    total = os.path.getsize(kept) + sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= CACHE_LIMIT:
+            break
+        os.remove(path)
+        total -= size
+
@@ -1,9 +1,16 @@
 # Import modules for the main game file
+import argparse
+import atexit
 import pygame
 import sys
+import time
+import audio
+import bundle
 import constants
-import levels
-from player import Player
+import replay
+import startup
+from game import Game
+from profiler import FrameProfiler
 
 """
 The Adventures of Tyler the Tiger
@@ -38,47 +45,83 @@ for audio and visuals are located in the same directory as the modules.
 """
 
 
-def main():
+def parse_args(argv=None):
+    """ Read the command line options. """
+
+    parser = argparse.ArgumentParser(
+        description="The Adventures of Tyler the Tiger"
+    )
+    parser.add_argument("--profile", action="store_true",
+                        help="time every frame from the start (F3 shows "
+                             "the timings)")
+    parser.add_argument("--profile-csv", metavar="FILE",
+                        help="write the timings of every frame to FILE "
+                             "on exit")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the input of this game to FILE")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play back the input recorded in FILE")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write the player's position every frame "
+                             "to FILE")
+    parser.add_argument("--startup-log", metavar="FILE",
+                        help="add the time to the first frame and to "
+                             "playable to FILE")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     # Main game
-    pygame.init()
+    start_time = time.perf_counter()
+    args = parse_args(argv)
+    audio.pre_init()
+
+    # Only the display is needed for the first frame
+    pygame.display.init()
 
     # Sets the height and width of the screen
     size = [constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT]
     screen = pygame.display.set_mode(size)
-
     pygame.display.set_caption("The Adventures of Tyler the Tiger")
-    icon = pygame.image.load("icon.png")
-    icon.set_colorkey(constants.GRAY)
-    pygame.display.set_icon(icon)
-
-    # Creates an instance of the player
-    player = Player()
-
-    # Game attribute variables
-    game_over = False
-    victory = False
-    game_start = False
-    help_screen = False
-    pygame.time.set_timer(pygame.USEREVENT, 1000)
 
-    # Create all the levels
-    level_list = []
-    level_list.append(levels.Level_01(player))
-    level_list.append(levels.Level_02(player))
-    level_list.append(levels.Level_03(player))
-
-    # Set the current level
-    current_level_no = 0
-    current_level = level_list[current_level_no]
+    # Show the title right away, then start everything else and load the
+    # rest of the images and sounds behind it
+    loader = startup.Startup(screen, start_time)
+    loader.show_title()
+    pygame.init()
 
-    active_sprite_list = pygame.sprite.Group()
-    player.level = current_level
+    icon = bundle.load_image(constants.ICON_FILE)
+    icon.set_colorkey(constants.GRAY)
+    pygame.display.set_icon(icon)
 
-    # Sets the player on the level
-    player.rect.x = 120
-    player.rect.y = constants.SCREEN_HEIGHT - 68
-    player.lose_jump = constants.SCREEN_HEIGHT - 67
-    active_sprite_list.add(player)
+    loader.load()
+
+    # Creates the player, the levels and the state of the game
+    game = Game()
+    loader.playable()
+    if args.startup_log:
+        loader.write_log(args.startup_log)
+
+    # A recording brings its own countdown ticks, so the real timer only
+    # runs when nothing is being played back
+    recorder = None
+    source = None
+    if args.replay:
+        source = replay.InputReplay(args.replay)
+    else:
+        pygame.time.set_timer(pygame.USEREVENT, 1000)
+    if args.record:
+        recorder = replay.InputRecorder(args.record)
+        atexit.register(recorder.close)
+    trace = None
+    if args.trace:
+        trace = open(args.trace, "w")
+        atexit.register(trace.close)
+
+    # Times the phases of every frame; F3 shows the rolling numbers
+    profiler = FrameProfiler(args.profile, csv_path=args.profile_csv)
+    game.profiler = profiler
+    atexit.register(profiler.write_csv)
 
     # Loop until the user clicks the close button
     done = False
@@ -86,151 +129,83 @@ def main():
     # Used to manage how fast the screen updates
     clock = pygame.time.Clock()
 
-    # Sound effects and background music
-    jump_sound = pygame.mixer.Sound("jump.ogg")
-    _ = pygame.mixer.music.load("Deep in the Rainforest.ogg")
-    pygame.mixer.music.play(-1, 0.0)
-
     # -------- Main Program Loop -----------
+    frame = 0
     while not done:
-
-        for event in pygame.event.get():  # User did something
+        frame += 1
+
+        events = pygame.event.get()
+        if source is not None:
+            # Play the recorded input; only closing the window gets through
+            events = [event for event in events
+                      if event.type == pygame.QUIT]
+            events = source.events(frame) + events
+            if source.finished:
+                # The recording is over; hand control back to the player
+                source = None
+                pygame.time.set_timer(pygame.USEREVENT, 1000)
+        if recorder is not None:
+            recorder.record(frame, events)
+
+        restarted = False
+        for event in events:  # User did something
             if event.type == pygame.USEREVENT:
-                if game_start is True:
-                    if constants.TIME > 0:
-                        if victory is True:
-                            constants.TIME = constants.TIME
-                        else:
-                            constants.TIME -= 1
+                game.countdown()
 
             if event.type == pygame.QUIT:  # If user clicked close
                 done = True  # Flag that we are done so we exit this loop
-                pygame.mixer.music.stop()
+                audio.default.stop_music()
                 sys.exit()
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_h and game_start is False:
-                    help_screen = True
-                if event.key == pygame.K_ESCAPE and game_start is False:
-                    help_screen = False
-                if event.key == pygame.K_SPACE and game_start is False:
-                    game_start = True
-                if event.key == pygame.K_LEFT and player.rect.x > 120:
-                    player.go_left()
-                if event.key == pygame.K_RIGHT and player.rect.x > 0:
-                    player.go_right()
-                if (event.key == pygame.K_UP and
-                   player.rect.y < player.lose_jump):
-                    player.jump()  # Player is above the platform
-                    jump_sound.play()
-                    if game_over is True:
-                        jump_sound.stop()
-
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_LEFT and player.change_x < 0:
-                    player.stop()
-                if event.key == pygame.K_RIGHT and player.change_x > 0:
-                    player.stop()
-
-            if event.type == pygame.MOUSEBUTTONDOWN and game_over is True:
-                if victory is True:  # Player won the game
-                    pygame.quit()
-                    sys.exit()
-                    break
-                elif constants.LIVES <= 1:  # Player has no more lives
+            game.handle_event(event)
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                profiler.toggle_overlay()
+                game.renderer.invalidate()
+
+            if event.type == pygame.MOUSEBUTTONDOWN and game.game_over:
+                if not game.can_restart():  # Won, or no more lives
                     pygame.quit()
                     sys.exit()
                     break
                 else:
-                    pygame.mixer_music.play()
-                    constants.TIME = 100  # Reset time
-                    constants.LIVES = constants.LIVES - 1  # Subtract a life
-                    constants.HEALTH = 100
-                    main()
-                    done = True
-
-        # Update the player
-        active_sprite_list.update()
-
-        # Update items in the level
-        current_level.update()
-
-        # If the player gets near the right side, shift the world left (-x)
-        if player.rect.x >= 500:
-            diff = player.rect.x - 500
-            player.rect.x = 500
-            current_level.shift_world(-diff)
-
-        # If the player gets near the left side, do not shift the world
-        if player.rect.x <= 120:
-            player.rect.x = 120
-            current_level.shift_world(0)
-
-        # If the player gets to the last level, end the game
-        current_position = player.rect.x + current_level.world_shift
-        if current_position < current_level.level_limit:
-            if current_level_no == len(level_list)-1:
-                game_over = True
-                victory = True
-                constants.TIME = constants.TIME
-                pygame.mixer.music.stop()
-
-        # If the player gets to the end of the level, go to the next level
-            if current_level_no < len(level_list)-1:
-                player.rect.x = 120
-                current_level_no += 1
-                current_level = level_list[current_level_no]
-                player.level = current_level
-                if constants.HEALTH == 100:
-                    constants.SCORE = 500
-                else:
-                    constants.SCORE = constants.HEALTH*5
-
-        # If the player falls while time remains, end game and reset time
-        if player.rect.y == 650 and constants.TIME >= 0:
-            game_over = True
-            constants.TIME = 0
-        else:
-            constants.LIVES = constants.LIVES
+                    # Start over in place and drop the rest of this frame
+                    game.restart()
+                    if source is None:
+                        pygame.time.set_timer(pygame.USEREVENT, 1000)
+                    restarted = True
+                    break
 
-        # If the time runs out, end the game and reset the time
-        if constants.TIME == 0:
-            game_over = True
-            pygame.mixer.music.stop()
-        else:
-            constants.LIVES = constants.LIVES
+        if restarted:
+            profiler.begin_frame()
+            continue
+        profiler.mark("events")
 
-        if constants.HEALTH == 0:
-            game_over = True
-            pygame.mixer.music.stop()
-        else:
-            constants.LIVES = constants.LIVES
+        # Move everything and check for the end of the level or game
+        game.update()
+        if trace is not None:
+            trace.write(replay.trace_line(frame, game))
 
         # All code to draw goes below this comment
-        if game_start is True:  # Draw game
-            if game_over is True:  # Game ended
-                if victory is True:
-                    player.winner_screen(screen)  # Draw the winner screen
-                else:
-                    player.game_over(screen)  # Draw the game over screen
-            else:
-                current_level.draw(screen)
-                active_sprite_list.draw(screen)
-                levels.timer(screen)
-                player.lives(screen)
-                player.health(screen)
-                player.score(screen)
-        elif help_screen is True:
-            player.help(screen)
-        else:
-            player.title_screen(screen)
+        update_rects = game.draw(screen)
+        if profiler.draw_overlay(screen):
+            # The overlay must not be scrolled along with the world
+            game.renderer.invalidate()
+            update_rects = None
+        profiler.mark("overlay")
         # All code to draw goes above this comment
 
         # Limit to 60 frames per second
         clock.tick(60)
+        profiler.mark("wait")
 
         # Go ahead and update the screen with what we've drawn
-        pygame.display.flip()
+        if update_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(update_rects)
+        profiler.mark("flip")
+        profiler.end_frame()
 
     # Need this line, so that the game will not hang when a user quits
     pygame.quit()
@@ -1,8 +1,11 @@
 """
 Module for managing platforms.
 """
+from array import array
+from bisect import bisect_left
+
 import pygame
-from spritesheet_functions import SpriteSheet
+from spritesheet_functions import SpriteSheet, named_image, register
 import constants
 
 # =============================================================================
@@ -25,6 +28,198 @@ STONE_PLATFORM_MIDDLE = (648, 648, 70, 40)
 STONE_PLATFORM_RIGHT = (792, 648, 70, 40)
 ENEMY_PLATFORM = (792, 827, 48, 90)
 
+# Names of the platform types. Level files refer to the types by name and
+# the level cache by their index in this tuple; the cache keeps a hash of
+# the tuple, so changing it makes the caches be rebuilt.
+TILE_TYPES = (
+    "LARGE_GRASS_LEFT",
+    "LARGE_GRASS_RIGHT",
+    "LARGE_GRASS_MIDDLE",
+    "SMALL_GRASS_LEFT",
+    "SMALL_GRASS_RIGHT",
+    "SMALL_GRASS_MIDDLE",
+    "STONE_PLATFORM_LEFT",
+    "STONE_PLATFORM_MIDDLE",
+    "STONE_PLATFORM_RIGHT",
+    "ENEMY_PLATFORM",
+)
+
+# Where each name is in TILE_TYPES
+TILE_TYPE_IDS = dict((name, i) for i, name in enumerate(TILE_TYPES))
+
+# The sheet all the platform types are on
+TILE_SHEET = "tiles_spritesheet.png"
+
+# Name every platform type so it can be found in the atlas
+for _name in TILE_TYPES:
+    register(_name, TILE_SHEET, globals()[_name])
+
+
+# Tile types already set up, keyed by name
+_tile_types = {}
+
+
+class TileType(object):
+    """ Everything static tiles of one type share: the name and the image.
+        There is only ever one of these per type. """
+
+    __slots__ = ("name", "image", "width", "height")
+
+    def __init__(self, name):
+        """ Constructor. Pass in one of the names in TILE_TYPES. """
+
+        self.name = name
+        self.image = named_image(name)
+        self.width, self.height = self.image.get_size()
+
+
+def tile_type(name):
+    """ Return the shared TileType for a name. """
+
+    shared = _tile_types.get(name)
+    if shared is None:
+        shared = TileType(name)
+        _tile_types[name] = shared
+    return shared
+
+
+class TileLayer(object):
+    """ All the platforms of a level that never move, kept as rows of
+        (type id, x, y) in compact arrays, so a level can have a great many
+        of them. Rects are only made for the tiles a query returns. """
+
+    def __init__(self):
+        """ Constructor. The layer starts out empty. """
+
+        # One row per tile, in the order they were added. The type id is
+        # the index of the type's name in TILE_TYPES
+        self.type_ids = array("B")
+        self.x = array("i")
+        self.y = array("i")
+
+        # The TileTypes in use, keyed by type id
+        self.kinds = {}
+
+        # The rows sorted by x, and their x values, for finding the tiles
+        # in a range. Rebuilt after tiles were added
+        self.by_x = array("i")
+        self.sorted_x = array("i")
+        self.sorted = True
+
+        # The widest tile, which bounds how far left of a range a tile
+        # that reaches into it can start
+        self.widest = 0
+
+    def __len__(self):
+        """ The number of tiles. """
+
+        return len(self.x)
+
+    def add(self, name, x, y):
+        """ Add a tile. Pass in the tile type name and the position. """
+
+        type_id = TILE_TYPE_IDS[name]
+        kind = self.kinds.get(type_id)
+        if kind is None:
+            kind = tile_type(name)
+            self.kinds[type_id] = kind
+        self.widest = max(self.widest, kind.width)
+
+        self.type_ids.append(type_id)
+        self.x.append(x)
+        self.y.append(y)
+        self.sorted = False
+
+    def rect(self, index):
+        """ Return the rect of a tile. """
+
+        kind = self.kinds[self.type_ids[index]]
+        return pygame.Rect(self.x[index], self.y[index], kind.width,
+                           kind.height)
+
+    def rects(self):
+        """ Return the rects of all the tiles, in the order they were
+            added. """
+
+        return [self.rect(index) for index in range(len(self.x))]
+
+    def sort(self):
+        """ Bring the rows sorted by x up to date. """
+
+        x = self.x
+        self.by_x = array("i", sorted(range(len(x)), key=x.__getitem__))
+        self.sorted_x = array("i", (x[index] for index in self.by_x))
+        self.sorted = True
+
+    def collide(self, rect):
+        """ Return the indexes of the tiles whose rects overlap a rect, in
+            the order the tiles were added. """
+
+        if not self.sorted:
+            self.sort()
+        first = bisect_left(self.sorted_x, rect.left - self.widest + 1)
+        last = bisect_left(self.sorted_x, rect.right)
+
+        found = []
+        kinds, type_ids, x, y = self.kinds, self.type_ids, self.x, self.y
+        for index in self.by_x[first:last]:
+            kind = kinds[type_ids[index]]
+            if (x[index] + kind.width > rect.left and
+                    y[index] < rect.bottom and
+                    y[index] + kind.height > rect.top):
+                found.append(index)
+        found.sort()
+        return found
+
+    def blits(self, rect, offset_x):
+        """ Return (image, position) for every tile overlapping a rect in
+            the world, moved offset_x to the right, ready for
+            Surface.blits. """
+
+        kinds, type_ids, x, y = self.kinds, self.type_ids, self.x, self.y
+        return [
+            (kinds[type_ids[index]].image, (x[index] + offset_x, y[index]))
+            for index in self.collide(rect)
+        ]
+
+
+class Span(object):
+    """ The collision shape of a run of static tiles that sit side by side
+        at the same height. Never drawn; the tiles are. """
+
+    __slots__ = ("rect",)
+
+    def __init__(self, rect):
+        """ Constructor. Pass in the rect covering the whole run. """
+
+        self.rect = rect
+
+
+def merge_tiles(rects):
+    """ Merge tile rects that touch or overlap horizontally and have the
+        same top and height into Spans. The spans come back in the order of
+        their first tile, so collisions are resolved in the same order. """
+
+    runs = {}
+    for order, rect in enumerate(rects):
+        runs.setdefault((rect.top, rect.height), []).append((rect, order))
+
+    spans = []
+    for row in runs.values():
+        row.sort(key=lambda item: item[0].left)
+        rect, first = row[0][0].copy(), row[0][1]
+        for other, order in row[1:]:
+            if other.left <= rect.right:
+                rect.width = max(rect.right, other.right) - rect.left
+                first = min(first, order)
+            else:
+                spans.append((first, Span(rect)))
+                rect, first = other.copy(), order
+        spans.append((first, Span(rect)))
+
+    spans.sort(key=lambda item: item[0])
+    return [span for first, span in spans]
+
 
 class Platform(pygame.sprite.Sprite):
     """ Platform the user can jump on """
@@ -35,7 +230,7 @@ class Platform(pygame.sprite.Sprite):
             code. """
         pygame.sprite.Sprite.__init__(self)
 
-        sprite_sheet = SpriteSheet("tiles_spritesheet.png")
+        sprite_sheet = SpriteSheet(TILE_SHEET)
         # Grab the image for this platform
         self.image = sprite_sheet.get_image(sprite_sheet_data[0],
                                             sprite_sheet_data[1],
@@ -96,10 +291,13 @@ class MovingPlatform(Platform):
            self.rect.top < self.boundary_top):
             self.change_y *= -1
 
-        cur_pos = self.rect.x - self.level.world_shift
+        cur_pos = self.rect.x
         if cur_pos < self.boundary_left or cur_pos > self.boundary_right:
             self.change_x *= -1
 
+        # Keep the level's collision grid up to date
+        self.level.platform_index.update(self)
+
 
 class Enemy(Platform):
     """ The class is for an Enemy. """
@@ -153,6 +351,6 @@ class Enemy(Platform):
            self.rect.top < self.boundary_top):
             self.change_y *= -1
 
-        cur_pos = self.rect.x - self.level.world_shift
+        cur_pos = self.rect.x
         if cur_pos < self.boundary_left or cur_pos > self.boundary_right:
             self.change_x *= -1
@@ -4,8 +4,18 @@ controlled sprite on the screen.
 """
 import pygame
 import constants
+import hud
+import screens
 from platforms import MovingPlatform
-from spritesheet_functions import SpriteSheet
+from spritesheet_functions import named_image, register
+
+# Where the walking frames are on the player's sprite sheet
+WALK_SHEET = "p1_walk.png"
+WALK_FRAMES = ((0, 96, 48, 48), (48, 96, 48, 48), (96, 96, 48, 48))
+
+# Name the frames PLAYER_WALK_1, 2 and 3 so they can be found in the atlas
+for _number, _rect in enumerate(WALK_FRAMES, 1):
+    register("PLAYER_WALK_%d" % _number, WALK_SHEET, _rect)
 
 
 class Player(pygame.sprite.Sprite):
@@ -20,8 +30,8 @@ class Player(pygame.sprite.Sprite):
     player_lives = 3
 
     # Hold the images for the sprite to animate it
-    walking_frames_l = []
-    walking_frames_r = []
+    walking_frames_l = None
+    walking_frames_r = None
 
     # Direction the player is facing
     direction = "R"
@@ -35,25 +45,17 @@ class Player(pygame.sprite.Sprite):
         # Call the parent's constructor
         pygame.sprite.Sprite.__init__(self)
 
-        sprite_sheet = SpriteSheet("p1_walk.png")
-        # Load all the right facing images into a list
-        image = sprite_sheet.get_image(0, 96, 48, 48)
-        self.walking_frames_r.append(image)
-        image = sprite_sheet.get_image(48, 96, 48, 48)
-        self.walking_frames_r.append(image)
-        image = sprite_sheet.get_image(96, 96, 48, 48)
-        self.walking_frames_r.append(image)
-
-        # Load all the right facing images, then flip them to face left
-        image = sprite_sheet.get_image(0, 96, 48, 48)
-        image = pygame.transform.flip(image, True, False)
-        self.walking_frames_l.append(image)
-        image = sprite_sheet.get_image(48, 96, 48, 48)
-        image = pygame.transform.flip(image, True, False)
-        self.walking_frames_l.append(image)
-        image = sprite_sheet.get_image(96, 96, 48, 48)
-        image = pygame.transform.flip(image, True, False)
-        self.walking_frames_l.append(image)
+        self.walking_frames_l = []
+        self.walking_frames_r = []
+
+        # Load all the right facing images into a list, then the left
+        # facing ones; the sheet mirrors them once
+        for number in range(1, len(WALK_FRAMES) + 1):
+            image = named_image("PLAYER_WALK_%d" % number)
+            self.walking_frames_r.append(image)
+        for number in range(1, len(WALK_FRAMES) + 1):
+            image = named_image("PLAYER_WALK_%d" % number, flip_x=True)
+            self.walking_frames_l.append(image)
 
         # Set the image the player starts with
         self.image = self.walking_frames_r[0]
@@ -61,6 +63,15 @@ class Player(pygame.sprite.Sprite):
         # Set a reference to the image rect.
         self.rect = self.image.get_rect()
 
+    def reset(self):
+        """ Put the player back the way it was when it was created. """
+
+        self.change_x = 0
+        self.change_y = 0
+        self.direction = "R"
+        self.image = self.walking_frames_r[0]
+        self.rect = self.image.get_rect()
+
     def update(self):
         """ Move the player. """
 
@@ -69,7 +80,7 @@ class Player(pygame.sprite.Sprite):
 
         # Move left or right
         self.rect.x += self.change_x
-        pos = self.rect.x + self.level.world_shift
+        pos = self.rect.x
         if self.direction == "R":
             frame = (pos // 30) % len(self.walking_frames_r)
             self.image = self.walking_frames_r[frame]
@@ -78,9 +89,7 @@ class Player(pygame.sprite.Sprite):
             self.image = self.walking_frames_l[frame]
 
         # See if we hit anything
-        block_hit_list = pygame.sprite.spritecollide(
-            self, self.level.platform_list, False
-        )
+        block_hit_list = self.level.collide_platforms(self)
         for block in block_hit_list:
             if self.change_x > 0:  # Moving right
                 # Set our right side to the left side of the item we hit
@@ -93,9 +102,7 @@ class Player(pygame.sprite.Sprite):
         self.rect.y += self.change_y
 
         # Check and see if we hit anything
-        block_hit_list = pygame.sprite.spritecollide(
-            self, self.level.platform_list, False
-        )
+        block_hit_list = self.level.collide_platforms(self)
         for block in block_hit_list:
 
             # Reset our position based on the top or bottom of the object
@@ -127,9 +134,7 @@ class Player(pygame.sprite.Sprite):
         """ Called when user hits 'jump' button. """
 
         self.rect.y += 1
-        platform_hit_list = pygame.sprite.spritecollide(
-            self, self.level.platform_list, False
-        )
+        platform_hit_list = self.level.collide_platforms(self)
         self.rect.y -= 1
 
         # If it is ok to jump, set our speed upwards
@@ -159,140 +164,38 @@ class Player(pygame.sprite.Sprite):
         """ Method to be called for displaying the lives on the screen. """
 
         if constants.GAME_OVER is False:
-            font = pygame.font.SysFont("serif", 36)
-            text = font.render(
-                "Lives: " + str(constants.LIVES), True, constants.TIGER_ORANGE
-            )
-            outline = font.render(
-                "Lives: " + str(constants.LIVES), True, constants.BLACK
+            hud.default.draw_field(
+                screen, "lives", "Lives: " + str(constants.LIVES), 675, 10
             )
-            pos_x = 675
-            pos_y = 10
-            screen.blit(outline, [pos_x - 1, pos_y - 1])
-            screen.blit(outline, [pos_x - 1, pos_y + 1])
-            screen.blit(outline, [pos_x + 1, pos_y - 1])
-            screen.blit(outline, [pos_x + 1, pos_y + 1])
-            screen.blit(text, [pos_x, pos_y])
 
     def health(self, screen):
         """ Method to be called for displaying the health on the screen. """
 
         if constants.GAME_OVER is False:
-            font = pygame.font.SysFont("serif", 36)
-            text = font.render(
-                "Health: " + str(constants.HEALTH),
-                True,
-                constants.TIGER_ORANGE
+            hud.default.draw_field(
+                screen, "health", "Health: " + str(constants.HEALTH), 475, 10
             )
-            outline = font.render(
-                "Health: " + str(constants.HEALTH), True, constants.BLACK
-            )
-            pos_x = 475
-            pos_y = 10
-            screen.blit(outline, [pos_x - 1, pos_y - 1])
-            screen.blit(outline, [pos_x - 1, pos_y + 1])
-            screen.blit(outline, [pos_x + 1, pos_y - 1])
-            screen.blit(outline, [pos_x + 1, pos_y + 1])
-            screen.blit(text, [pos_x, pos_y])
 
     def score(self, screen):
         """ Method to be called for displaying the score on the screen. """
 
         if constants.GAME_OVER is False:
-            font = pygame.font.SysFont("serif", 36)
-            text = font.render(
-                "Score: " + str(constants.SCORE), True, constants.TIGER_ORANGE
-            )
-            outline = font.render(
-                "Score: " + str(constants.SCORE), True, constants.BLACK
+            hud.default.draw_field(
+                screen, "score", "Score: " + str(constants.SCORE), 225, 10
             )
-            pos_x = 225
-            pos_y = 10
-            screen.blit(outline, [pos_x - 1, pos_y - 1])
-            screen.blit(outline, [pos_x - 1, pos_y + 1])
-            screen.blit(outline, [pos_x + 1, pos_y - 1])
-            screen.blit(outline, [pos_x + 1, pos_y + 1])
-            screen.blit(text, [pos_x, pos_y])
 
     def game_over(self, screen):
         """Method to be called for displaying the game over screen."""
-        self.game_over_music = pygame.mixer.music.load("Game Over.ogg")
-        screen.fill(constants.WHITE)
-
-        if self.game_over:
-            # Draw if the player loses and has lost all of their lives
-            if constants.LIVES - 1 == 0:
-                self.background = pygame.image.load("game_over.png")
-                screen.blit(self.background, [0, 0])
-            # Draw if the player loses and has lives remaining
-            else:
-                self.background = pygame.image.load("mouse_restart.png")
-                screen.blit(self.background, [0, 0])
+        screens.default.game_over(screen)
 
     def winner_screen(self, screen):
         """ Method to be called for displaying the winner screen. """
-        screen.fill(constants.WHITE)
-
-        # Player has reached the end of the game
-        self.background = pygame.image.load("winner_screen.png")
-        font = pygame.font.SysFont("serif", 84)
-        score = (
-            (constants.TIME*100)+(constants.LIVES*1000)+(constants.HEALTH*10)
-        )
-        scoretext = font.render(str(score), True, constants.TIGER_ORANGE)
-        outlinetext = font.render(str(score), True, constants.BLACK)
-        pos_x = (constants.SCREEN_WIDTH // 2) - (scoretext.get_width() // 2)
-        pos_y = (constants.SCREEN_HEIGHT // 2) - (scoretext.get_height() // 2)
-        outpos_x = (
-            (constants.SCREEN_WIDTH // 2) - (outlinetext.get_width() // 2)
-        )
-        outpos_y = (
-            (constants.SCREEN_HEIGHT // 2) - (outlinetext.get_height() // 2)
-        )
-        screen.blit(self.background, [0, 0])
-        screen.blit(outlinetext, [outpos_x + 129, outpos_y + 19])
-        screen.blit(outlinetext, [outpos_x + 129, outpos_y + 21])
-        screen.blit(outlinetext, [outpos_x + 131, outpos_y + 19])
-        screen.blit(outlinetext, [outpos_x + 131, outpos_y + 21])
-        screen.blit(scoretext, [pos_x + 130, pos_y + 20])
+        screens.default.winner_screen(screen)
 
     def title_screen(self, screen):
         """ Method that draws the title screen. """
-        screen.fill(constants.WHITE)
-
-        if constants.LIVES < 3:
-            self.background = pygame.image.load("intermission_screen.png")
-            font = pygame.font.SysFont("serif", 84)
-            text = font.render(
-                str(constants.LIVES), True, constants.TIGER_ORANGE
-            )
-            outline_text = font.render(
-                str(constants.LIVES), True, constants.BLACK
-            )
-            center_x = (constants.SCREEN_WIDTH // 2) - (text.get_width() // 2)
-            center_y = (
-                (constants.SCREEN_HEIGHT // 2) - (text.get_height() // 2)
-            )
-            pos_x = (
-                (constants.SCREEN_WIDTH // 2) -
-                (outline_text.get_width() // 2)
-            )
-            pos_y = (
-                (constants.SCREEN_HEIGHT // 2) -
-                (outline_text.get_height() // 2)
-            )
-            screen.blit(self.background, [0, 0])
-            screen.blit(outline_text, [pos_x + 49, pos_y - 29])
-            screen.blit(outline_text, [pos_x + 49, pos_y - 31])
-            screen.blit(outline_text, [pos_x + 51, pos_y - 29])
-            screen.blit(outline_text, [pos_x + 51, pos_y - 31])
-            screen.blit(text, [center_x + 50, center_y - 30])
-        else:
-            self.background = pygame.image.load("title_screen.png")
-            screen.blit(self.background, [0, 0])
+        screens.default.title_screen(screen)
 
     def help(self, screen):
         """ Method that draws the help screen. """
-        screen.fill(constants.WHITE)
-        self.background = pygame.image.load("help_screen.png")
-        screen.blit(self.background, [0, 0])
+        screens.default.help(screen)
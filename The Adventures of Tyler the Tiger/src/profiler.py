@@ -0,0 +1,151 @@
+"""
+This module holds a small per-phase frame profiler. The main loop marks the
+end of each phase of a frame; the profiler keeps the last few hundred frames
+in a ring buffer, can draw rolling statistics on top of the game, and can
+write every frame's timings to a CSV file.
+"""
+import csv
+import time
+from collections import deque
+
+import pygame
+import constants
+
+# The phases of a frame, in the order they happen
+PHASES = ("events", "player", "level", "scroll", "state", "draw", "hud",
+          "overlay", "wait", "flip")
+
+# How many frames the rolling statistics cover
+CAPACITY = 300
+
+# Redraw the overlay text every this many frames
+OVERLAY_REFRESH = 15
+
+
+class FrameProfiler(object):
+    """ Times the phases of every frame. Does nothing but return when it
+        is disabled. """
+
+    def __init__(self, enabled=False, capacity=CAPACITY, csv_path=None):
+        """ Constructor. Pass in whether to start enabled, how many frames
+            to keep and an optional CSV file to write all frames to. """
+
+        self.enabled = enabled or csv_path is not None
+        self.csv_path = csv_path
+        self.show_overlay = False
+
+        # Rolling timings in milliseconds, one ring buffer per phase
+        self.history = dict(
+            (phase, deque(maxlen=capacity)) for phase in PHASES
+        )
+        self.frame_times = deque(maxlen=capacity)
+
+        # Every frame since the start, only kept when writing a CSV
+        self.rows = []
+
+        # The frame being measured
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = time.perf_counter()
+        self.last = self.frame_start
+        self.frame_no = 0
+
+        self.font = None
+        self.overlay = None
+
+    def toggle_overlay(self):
+        """ Show or hide the overlay. Showing it turns profiling on. """
+
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay and not self.enabled:
+            self.enabled = True
+            self.begin_frame()
+
+    def begin_frame(self):
+        """ Start timing a new frame. """
+
+        if not self.enabled:
+            return
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """ Add the time since the last mark to a phase. """
+
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """ Store the frame that was just timed and start the next one. """
+
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        for phase in PHASES:
+            self.history[phase].append(self.current[phase] * 1000.0)
+        self.frame_times.append((now - self.frame_start) * 1000.0)
+        if self.csv_path is not None:
+            row = [self.frame_no]
+            row.extend(self.current[phase] * 1000.0 for phase in PHASES)
+            self.rows.append(row)
+        self.frame_no += 1
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = now
+
+    def stats(self, phase):
+        """ Return the rolling (mean, p95, max) of a phase in
+            milliseconds. """
+
+        times = self.history[phase]
+        if not times:
+            return 0.0, 0.0, 0.0
+        ordered = sorted(times)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return sum(ordered) / len(ordered), p95, ordered[-1]
+
+    def draw_overlay(self, screen):
+        """ Draw the statistics in the top left corner if the overlay is
+            on. Returns True if something was drawn. """
+
+        if not self.show_overlay:
+            return False
+        if self.overlay is None or self.frame_no % OVERLAY_REFRESH == 0:
+            self.overlay = self.render_overlay()
+        screen.blit(self.overlay, [10, 60])
+        return True
+
+    def render_overlay(self):
+        """ Render the statistics table onto a new surface. """
+
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 14)
+        lines = ["phase      mean    p95    max  (ms)"]
+        for phase in PHASES:
+            lines.append("%-8s %6.2f %6.2f %6.2f" % ((phase,) +
+                                                     self.stats(phase)))
+        frame = sorted(self.frame_times) or [0.0]
+        lines.append("%-8s %6.2f %6.2f %6.2f" % (
+            "frame", sum(frame) / len(frame),
+            frame[min(len(frame) - 1, int(len(frame) * 0.95))], frame[-1]))
+
+        height = self.font.get_linesize()
+        width = max(self.font.size(line)[0] for line in lines)
+        overlay = pygame.Surface([width + 8, height * len(lines) + 8])
+        overlay.fill(constants.BLACK)
+        for i, line in enumerate(lines):
+            text = self.font.render(line, True, constants.WHITE)
+            overlay.blit(text, [4, 4 + i * height])
+        return overlay
+
+    def write_csv(self):
+        """ Write every frame timed so far to the CSV file, if one was
+            given. """
+
+        if self.csv_path is None:
+            return
+        with open(self.csv_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["frame"] + [phase + "_ms" for phase in PHASES])
+            writer.writerows(self.rows)
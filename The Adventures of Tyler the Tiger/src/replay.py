@@ -0,0 +1,218 @@
+"""
+Records the input of a game to a file and plays it back.
+
+The game only changes when it gets an event or steps a frame, so the keys,
+mouse clicks and countdown ticks each frame got are all that is needed to
+play the same game again, frame for frame. A recording can be played back
+in the window (platform_scroller.py --replay FILE) or with no window:
+    python replay.py game.rec --trace replay.txt
+
+--trace writes where the player was on every frame, so two runs can be
+compared with any diff tool.
+"""
+import argparse
+import struct
+
+import pygame
+import constants
+from game import Game
+
+# File header: magic and version
+MAGIC = b"TREC"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+
+# One event: frame, kind, key or button, mouse x, mouse y
+RECORD = struct.Struct("<IBihh")
+
+# The kinds of event that are recorded
+KEYDOWN = 0
+KEYUP = 1
+MOUSEBUTTONDOWN = 2
+TIMER = 3
+QUIT = 4
+
+EVENT_KINDS = {
+    pygame.KEYDOWN: KEYDOWN,
+    pygame.KEYUP: KEYUP,
+    pygame.MOUSEBUTTONDOWN: MOUSEBUTTONDOWN,
+    pygame.USEREVENT: TIMER,
+    pygame.QUIT: QUIT,
+}
+EVENT_TYPES = dict((kind, event_type)
+                   for event_type, kind in EVENT_KINDS.items())
+
+
+def pack(frame, event):
+    """ Return the bytes for one event, or None if it is not recorded. """
+
+    kind = EVENT_KINDS.get(event.type)
+    if kind is None:
+        return None
+    code = 0
+    x, y = 0, 0
+    if kind in (KEYDOWN, KEYUP):
+        code = event.key
+    elif kind == MOUSEBUTTONDOWN:
+        code = event.button
+        x, y = event.pos
+    return RECORD.pack(frame, kind, code, x, y)
+
+
+def unpack(data):
+    """ Return the frame and the pygame event stored in a record. """
+
+    frame, kind, code, x, y = RECORD.unpack(data)
+    event_type = EVENT_TYPES[kind]
+    if kind in (KEYDOWN, KEYUP):
+        event = pygame.event.Event(event_type, key=code)
+    elif kind == MOUSEBUTTONDOWN:
+        event = pygame.event.Event(event_type, button=code, pos=(x, y))
+    else:
+        event = pygame.event.Event(event_type)
+    return frame, event
+
+
+class InputRecorder(object):
+    """ Writes the events of every frame to a recording file. """
+
+    def __init__(self, path):
+        """ Constructor. Pass in the file to record to. """
+
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.events = 0
+
+    def record(self, frame, events):
+        """ Add the events a frame got, in the order it got them. """
+
+        for event in events:
+            data = pack(frame, event)
+            if data is not None:
+                self.file.write(data)
+                self.events += 1
+
+    def close(self):
+        """ Finish the file. Safe to call more than once. """
+
+        if not self.file.closed:
+            self.file.close()
+
+
+class InputReplay(object):
+    """ Hands out the events of a recording, frame by frame. """
+
+    def __init__(self, path):
+        """ Constructor. Pass in the recording to play. """
+
+        with open(path, "rb") as replay_file:
+            data = replay_file.read()
+        magic, version = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s is not a recording this version can play"
+                             % path)
+
+        # Events in order, as (frame, event)
+        self.records = [
+            unpack(data[start:start + RECORD.size])
+            for start in range(HEADER.size, len(data), RECORD.size)
+        ]
+        self.position = 0
+
+    @property
+    def finished(self):
+        """ True once every recorded event has been handed out. """
+
+        return self.position >= len(self.records)
+
+    def events(self, frame):
+        """ Return the recorded events of a frame. """
+
+        events = []
+        records = self.records
+        while (self.position < len(records) and
+               records[self.position][0] <= frame):
+            events.append(records[self.position][1])
+            self.position += 1
+        return events
+
+
+def trace_line(frame, game):
+    """ Return one line of a trace: the frame, the level and where the
+        player is in the world. """
+
+    rect = game.player.rect
+    return "%d %d %d %d\n" % (frame, game.current_level_no, rect.x, rect.y)
+
+
+def run(path, trace_path=None):
+    """ Play a recording with no window, exactly like the main loop would,
+        and return a dict with where it ended. """
+
+    # Imported here: it switches SDL to its dummy drivers, which the
+    # window must not get when it only records or replays
+    import headless
+    headless.init()
+    headless.reset_constants()
+    replay = InputReplay(path)
+    game = Game(audio=False, prefetch=False)
+    trace = open(trace_path, "w") if trace_path else None
+
+    frame = 0
+    quit_game = False
+    while not replay.finished and not quit_game:
+        frame += 1
+        restarted = False
+        for event in replay.events(frame):
+            if event.type == pygame.USEREVENT:
+                game.countdown()
+            if event.type == pygame.QUIT:
+                quit_game = True
+                break
+
+            game.handle_event(event)
+
+            if event.type == pygame.MOUSEBUTTONDOWN and game.game_over:
+                if not game.can_restart():
+                    quit_game = True
+                    break
+                game.restart()
+                restarted = True
+                break
+
+        if restarted or quit_game:
+            continue
+        game.update()
+        if trace is not None:
+            trace.write(trace_line(frame, game))
+
+    if trace is not None:
+        trace.close()
+    return {
+        "frames": frame,
+        "level": game.current_level_no,
+        "x": game.player.rect.x,
+        "y": game.player.rect.y,
+        "time": constants.TIME,
+        "health": constants.HEALTH,
+        "lives": constants.LIVES,
+        "score": constants.SCORE,
+    }
+
+
+def main():
+    """ Play a recording with no window and print how it ended. """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().split("\n\n")[0]
+    )
+    parser.add_argument("recording", help="file made with --record")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write the player's position every frame")
+    args = parser.parse_args()
+    print(run(args.recording, args.trace))
+
+
+if __name__ == "__main__":
+    main()
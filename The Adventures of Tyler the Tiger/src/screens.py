@@ -0,0 +1,119 @@
+"""
+This module holds the full-screen images shown outside of gameplay: the
+title, help, intermission, game over and winner screens.
+"""
+import assets
+import constants
+import hud
+
+# Every full-screen image the game shows
+SCREEN_FILES = {
+    "title": "title_screen.png",
+    "intermission": "intermission_screen.png",
+    "help": "help_screen.png",
+    "game_over": "game_over.png",
+    "restart": "mouse_restart.png",
+    "winner": "winner_screen.png",
+}
+
+# Size of the numbers drawn on the winner and intermission screens
+BIG_FONT_SIZE = 84
+
+
+class ScreenManager(object):
+    """ Keeps every full-screen image decoded and flattened onto white, and
+        caches the screens that have a number drawn on top of them. """
+
+    def __init__(self):
+        """ Constructor. The images are loaded on first use or by load(). """
+
+        # Flattened screen images, keyed by screen name
+        self.images = {}
+
+        # Screens with a number on them: name -> (number, surface)
+        self.composed = {}
+
+        # The screen drawn last, so we can spot state transitions
+        self.current = None
+
+    def load(self):
+        """ Decode every screen up front. Needs the display to be set. """
+
+        for name in SCREEN_FILES:
+            self.image(name)
+
+    def image(self, name):
+        """ Return the display-format image for a screen. """
+
+        image = self.images.get(name)
+        if image is None:
+            image = assets.load_image(
+                SCREEN_FILES[name], background=constants.WHITE
+            )
+            self.images[name] = image
+        return image
+
+    def composed_image(self, name, number, offset_x, offset_y):
+        """ Return the screen with the number drawn in the middle, moved
+            by offset_x, offset_y. Only redrawn when the number changes. """
+
+        cached = self.composed.get(name)
+        if cached is not None and cached[0] == number:
+            return cached[1]
+
+        image = self.image(name).copy()
+        text = hud.default.render_outlined(str(number), BIG_FONT_SIZE)
+        pos_x = (constants.SCREEN_WIDTH // 2) - ((text.get_width() - 2) // 2)
+        pos_y = (
+            (constants.SCREEN_HEIGHT // 2) - ((text.get_height() - 2) // 2)
+        )
+        image.blit(text, [pos_x + offset_x - 1, pos_y + offset_y - 1])
+
+        self.composed[name] = (number, image)
+        return image
+
+    def show(self, screen, name, image):
+        """ Draw a full-screen image and remember which screen is up. """
+
+        self.current = name
+        screen.blit(image, [0, 0])
+
+    def title_screen(self, screen):
+        """ Draw the title screen, or the intermission screen with the
+            number of lives left after losing one. """
+
+        if constants.LIVES < 3:
+            image = self.composed_image(
+                "intermission", constants.LIVES, 50, -30
+            )
+            self.show(screen, "intermission", image)
+        else:
+            self.show(screen, "title", self.image("title"))
+
+    def help(self, screen):
+        """ Draw the help screen. """
+
+        self.show(screen, "help", self.image("help"))
+
+    def game_over(self, screen):
+        """ Draw the game over screen. """
+
+        # Draw if the player loses and has lost all of their lives
+        if constants.LIVES - 1 == 0:
+            self.show(screen, "game_over", self.image("game_over"))
+        # Draw if the player loses and has lives remaining
+        else:
+            self.show(screen, "restart", self.image("restart"))
+
+    def winner_screen(self, screen):
+        """ Draw the winner screen with the final score. """
+
+        score = (
+            (constants.TIME*100)+(constants.LIVES*1000)+(constants.HEALTH*10)
+        )
+        image = self.composed_image("winner", score, 130, 20)
+        self.show(screen, "winner", image)
+
+
+# The screens shared by the game
+default = ScreenManager()
@@ -0,0 +1,109 @@
+"""
+This module holds a spatial hash used to find the sprites near a rect
+without looking at every sprite in the level.
+"""
+
+# Size of a grid cell in pixels. A bit bigger than the player and tiles, so
+# most queries only touch one to four cells.
+CELL_SIZE = 128
+
+
+class SpatialHash(object):
+    """ Sorts sprites into a uniform grid keyed on their world rects.
+        Sprites that move must call update() after they move. """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        """ Constructor. Pass in the size of a grid cell. """
+
+        self.cell_size = cell_size
+
+        # Grid cell -> sprites in it
+        self.cells = {}
+
+        # Sprite -> (cells it is in, insertion order)
+        self.entries = {}
+        self.count = 0
+
+        # How many queries were run and how many sprites they looked at.
+        # Only collision checks query the hash, so these measure collision
+        # work alone; drawing culls without it
+        self.queries = 0
+        self.candidates = 0
+
+    def cells_for(self, rect):
+        """ Return the grid cells a rect covers. """
+
+        size = self.cell_size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        return tuple(
+            (x, y)
+            for x in range(left, right + 1)
+            for y in range(top, bottom + 1)
+        )
+
+    def insert(self, sprite):
+        """ Add a sprite to the grid. """
+
+        cells = self.cells_for(sprite.rect)
+        self.entries[sprite] = (cells, self.count)
+        self.count += 1
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(sprite)
+
+    def remove(self, sprite):
+        """ Take a sprite out of the grid. """
+
+        cells = self.entries.pop(sprite)[0]
+        for cell in cells:
+            self.remove_from_cell(cell, sprite)
+
+    def remove_from_cell(self, cell, sprite):
+        """ Take a sprite out of one grid cell. """
+
+        bucket = self.cells[cell]
+        bucket.remove(sprite)
+        if not bucket:
+            del self.cells[cell]
+
+    def update(self, sprite):
+        """ Move a sprite to the cells that match its current rect. Only
+            touches the grid when it crossed into other cells. """
+
+        old_cells, order = self.entries[sprite]
+        cells = self.cells_for(sprite.rect)
+        if cells == old_cells:
+            return
+        for cell in old_cells:
+            if cell not in cells:
+                self.remove_from_cell(cell, sprite)
+        for cell in cells:
+            if cell not in old_cells:
+                self.cells.setdefault(cell, []).append(sprite)
+        self.entries[sprite] = (cells, order)
+
+    def query(self, rect):
+        """ Return the sprites in the cells a rect covers, in the order they
+            were inserted. They may not actually touch the rect. """
+
+        found = set()
+        cells = self.cells
+        for cell in self.cells_for(rect):
+            bucket = cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        self.queries += 1
+        self.candidates += len(found)
+        entries = self.entries
+        return sorted(found, key=lambda sprite: entries[sprite][1])
+
+    def collide(self, rect):
+        """ Return the sprites whose rects overlap a rect, in the order
+            they were inserted, like pygame.sprite.spritecollide. """
+
+        return [
+            sprite for sprite in self.query(rect)
+            if rect.colliderect(sprite.rect)
+        ]
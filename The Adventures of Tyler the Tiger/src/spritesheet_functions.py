@@ -1,34 +1,214 @@
 """
 This module is used to pull individual sprites from sprite sheets.
+
+Sprites can also be asked for by name. When build_atlas.py has packed the
+sprites into one atlas image, they are cut from the atlas instead of the
+separate sheets, which are then never loaded.
 """
+import json
+import os
+
 import pygame
+import assets
+import bundle
 import constants
 
+# The manifest build_atlas.py writes next to the atlas image
+ATLAS_MANIFEST = "atlas.json"
+ATLAS_VERSION = 1
+
+# Where every named sprite comes from: name -> (sheet file, (x, y, w, h))
+_sources = {}
+
+# The atlas: None until it has been looked for, then the manifest with
+# its rects indexed, or False if there is no atlas that can be used
+_atlas = None
+
+# Sprites already cut out of a sheet, keyed by
+# (file name, x, y, w, h, flip_x, flip_y)
+_image_cache = {}
+
+# How often get_image could reuse a sprite and how often it had to cut one,
+# and how many sprites are drawn each way
+_image_stats = {"hits": 0, "misses": 0, "opaque": 0, "colorkey": 0,
+                "alpha": 0}
+
+
+def register(name, file_name, rect):
+    """ Give a sprite on a sheet a name. """
+
+    _sources[name] = (file_name, tuple(rect))
+
+
+def sources():
+    """ Return every named sprite as name -> (sheet file, rect). """
+
+    return dict(_sources)
+
+
+def read_manifest(name):
+    """ Read an atlas manifest asset. Returns None if there is none, if it
+        is from another version, or if a sheet changed after it was built.
+        A bundled atlas is stale when a sheet is no longer served from the
+        bundle, because its loose file changed. """
+
+    try:
+        manifest = json.loads(bytes(bundle.read(name)))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != ATLAS_VERSION:
+        return None
+
+    sprites = manifest["sprites"]
+    sheets = set(entry["sheet"] for entry in sprites.values())
+    if bundle.bundled(name):
+        if not all(bundle.bundled(sheet) for sheet in sheets):
+            return None
+    else:
+        try:
+            built = os.path.getmtime(bundle.path(manifest["image"]))
+            for sheet in sheets:
+                if os.path.getmtime(bundle.path(sheet)) > built:
+                    return None
+        except OSError:
+            return None
+
+    # Also find the sprites by where they are on their sheet, so rects
+    # like the ones in platforms.py resolve to the atlas too
+    manifest["rects"] = dict(
+        ((entry["sheet"], tuple(entry["source"])), tuple(entry["rect"]))
+        for entry in sprites.values()
+    )
+    return manifest
+
+
+def atlas():
+    """ Return the atlas manifest, or None if the sheets have to be
+        used. The manifest is only read once. """
+
+    global _atlas
+    if _atlas is None:
+        _atlas = read_manifest(ATLAS_MANIFEST) or False
+    return _atlas or None
+
+
+def prepare_image(source):
+    """ Turn a sprite cut from a sheet, still with the sheet's alpha, into
+        a display-format image that is as cheap to draw as it can be:
+        - "opaque": nothing to see through, a plain copy;
+        - "colorkey": black is see-through, drawn with an RLE colorkey;
+        - "alpha": soft edges, drawn with RLE per-pixel alpha.
+        Returns (image, how it is drawn). """
+
+    width, height = source.get_size()
+    visible = pygame.mask.from_surface(source, 0).count()
+    solid = pygame.mask.from_surface(source, 254).count()
+    if visible != solid:
+        image = source.convert_alpha()
+        image.set_alpha(255, pygame.RLEACCEL)
+        return image, "alpha"
+
+    # Assuming black works as the transparent color
+    image = source.convert()
+    image.set_colorkey(constants.BLACK)
+    if pygame.mask.from_surface(image).count() == width * height:
+        image.set_colorkey(None)
+        return image, "opaque"
+    image.set_colorkey(constants.BLACK, pygame.RLEACCEL)
+    return image, "colorkey"
+
 
 class SpriteSheet(object):
     """ Class used to grab images out of a sprite sheet. """
-    # This points to our sprite sheet image
-    sprite_sheet = None
 
     def __init__(self, file_name):
         """ Constructor. Pass in the file name of the sprite sheet. """
 
-        # Load the sprite sheet.
-        self.sprite_sheet = pygame.image.load(file_name).convert()
+        self.file_name = file_name
+
+    @property
+    def sprite_sheet(self):
+        """ The whole sheet. Only loaded for sprites the atlas does not
+            have; the registry only decodes each file once. The alpha is
+            kept so each sprite can be drawn the best way. """
+
+        return assets.load_image(self.file_name, alpha=True)
 
-    def get_image(self, x, y, width, height):
+    def get_image(self, x, y, width, height, flip_x=False, flip_y=False):
         """ Grab a single image out of a larger spritesheet
             Pass in the x, y location of the sprite
-            and the width and height of the sprite. """
+            and the width and height of the sprite, and whether to mirror
+            it left to right or top to bottom.
+            Identical requests share the same Surface, so callers must not
+            draw onto the returned image. """
 
-        # Create a new blank image
-        image = pygame.Surface([width, height]).convert()
+        key = (self.file_name, x, y, width, height, flip_x, flip_y)
+        image = _image_cache.get(key)
+        if image is not None:
+            _image_stats["hits"] += 1
+            return image
+        _image_stats["misses"] += 1
 
-        # Copy the sprite from the large sheet onto the smaller image
-        image.blit(self.sprite_sheet, (0, 0), (x, y, width, height))
+        # Cut the sprite out of the atlas, or else out of the large sheet,
+        # and mirror it if asked
+        rect = None
+        packed = atlas()
+        if packed is not None:
+            rect = packed["rects"].get((self.file_name,
+                                        (x, y, width, height)))
+        if rect is not None:
+            image = assets.load_image(packed["image"], alpha=True)
+            image = image.subsurface(rect)
+        else:
+            image = self.sprite_sheet.subsurface([x, y, width, height])
+        if flip_x or flip_y:
+            image = pygame.transform.flip(image, flip_x, flip_y)
 
-        # Assuming black works as the transparent color
-        image.set_colorkey(constants.BLACK)
+        image, mode = prepare_image(image)
+        _image_stats[mode] += 1
+        _image_cache[key] = image
 
         # Return the image
         return image
+
+
+def named_image(name, flip_x=False, flip_y=False):
+    """ Return a sprite by the name it was registered or packed under. """
+
+    packed = atlas()
+    if packed is not None and name in packed["sprites"]:
+        entry = packed["sprites"][name]
+        file_name, rect = entry["sheet"], entry["source"]
+    else:
+        file_name, rect = _sources[name]
+    return SpriteSheet(file_name).get_image(rect[0], rect[1], rect[2],
+                                            rect[3], flip_x, flip_y)
+
+
+def cache_stats():
+    """ Return the hit/miss counters for both the sheet registry and the
+        sprite cache, so load time and surface counts can be checked. """
+
+    sheet_stats = assets.stats()
+    return {
+        "sheet_hits": sheet_stats["hits"],
+        "sheet_misses": sheet_stats["misses"],
+        "image_hits": _image_stats["hits"],
+        "image_misses": _image_stats["misses"],
+        "images": len(_image_cache),
+        "opaque": _image_stats["opaque"],
+        "colorkey": _image_stats["colorkey"],
+        "alpha": _image_stats["alpha"],
+    }
+
+
+def clear():
+    """ Forget every cut-out sprite and the atlas, reset the counters, and
+        clear the image registry they were cut from. """
+
+    global _atlas
+    _atlas = None
+    _image_cache.clear()
+    for name in _image_stats:
+        _image_stats[name] = 0
+    assets.clear()
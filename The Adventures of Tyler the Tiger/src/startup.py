@@ -0,0 +1,160 @@
+"""
+Startup pipeline. The title screen goes up as soon as the window is open;
+the rest of the images and sounds are then decoded on a pool of worker
+threads while a progress bar fills in under the title. Only decoding
+happens on the workers: converting to the display format has to be done
+on the main thread, so finished images are converted there between
+frames. Images that are in the pixel cache are only read, not decoded.
+
+The time to the first frame and the time until the game can be played
+are measured, and can be appended to a log file to follow them from one
+release to the next.
+"""
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pygame
+import assets
+import audio
+import background
+import constants
+import level_loader
+import screens
+import spritesheet_functions
+import platforms  # noqa: F401 (names the platform sprites)
+import player  # noqa: F401 (names the player's frames)
+
+# Worker threads that decode files
+LOAD_WORKERS = 4
+
+# The progress bar under the title
+PROGRESS_RECT = pygame.Rect(250, 570, 300, 10)
+
+# Longest time between two frames of the loading screen, in seconds
+FRAME_TIME = 1.0 / 60
+
+
+def image_jobs(backgrounds):
+    """ Return (file name, alpha, background) for every image the game
+        converts, except the title screen, which is already up. Pass in
+        the level backgrounds. """
+
+    jobs = [(file_name, False, constants.WHITE)
+            for name, file_name in sorted(screens.SCREEN_FILES.items())
+            if name != "title"]
+
+    packed = spritesheet_functions.atlas()
+    if packed is not None:
+        sheets = [packed["image"]]
+    else:
+        sheets = sorted(set(
+            file_name
+            for file_name, _ in spritesheet_functions.sources().values()
+        ))
+    jobs.extend((file_name, True, None) for file_name in sheets)
+
+    jobs.extend((file_name, False, constants.WHITE)
+                for file_name in backgrounds)
+    return jobs
+
+
+def background_files():
+    """ Return the background image of every level file. """
+
+    files = set()
+    for file_name in level_loader.level_files():
+        files.add(level_loader.load(file_name).background)
+    return sorted(files)
+
+
+class Startup(object):
+    """ Gets the game from a blank window to playable and times it. """
+
+    def __init__(self, screen, start_time, workers=LOAD_WORKERS):
+        """ Constructor. Pass in the display surface, the
+            time.perf_counter() the program started at and how many
+            worker threads to decode with. """
+
+        self.screen = screen
+        self.start_time = start_time
+        self.workers = workers
+
+        # Seconds from the start to the first frame and to playable
+        self.metrics = {}
+
+    def elapsed(self):
+        """ Seconds since the program started. """
+
+        return time.perf_counter() - self.start_time
+
+    def show_title(self):
+        """ Put the title screen up. Only the title image is decoded. """
+
+        screens.default.title_screen(self.screen)
+        pygame.display.flip()
+        self.metrics["time_to_first_frame"] = self.elapsed()
+
+    def draw_progress(self, fraction):
+        """ Draw the title screen with a progress bar under it. """
+
+        screens.default.title_screen(self.screen)
+        filled = PROGRESS_RECT.copy()
+        filled.width = int(PROGRESS_RECT.width * fraction)
+        self.screen.fill(constants.TIGER_ORANGE, filled)
+        pygame.draw.rect(self.screen, constants.BLACK, PROGRESS_RECT, 1)
+        pygame.display.flip()
+
+    def load(self):
+        """ Decode everything on the workers and convert it here, keeping
+            the progress bar moving. Returns once all of it is done.
+            Closing the window still works; other input waits in the
+            queue until the game is ready for it. """
+
+        backgrounds = background_files()
+        jobs = image_jobs(backgrounds)
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="asset-load") as pool:
+            pending = dict(
+                (pool.submit(assets.prefetch, *job), job) for job in jobs
+            )
+            if audio.default.start():
+                pending[pool.submit(audio.default.load)] = None
+
+            total = len(pending)
+            while pending:
+                if pygame.event.get(pygame.QUIT):
+                    pygame.quit()
+                    sys.exit()
+
+                finished, _ = wait(pending, timeout=FRAME_TIME,
+                                   return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = pending.pop(future)
+                    future.result()
+                    if job is None:
+                        continue
+                    file_name, alpha, fill = job
+                    assets.load_image(file_name, alpha, fill)
+                    if file_name in backgrounds:
+                        background.layer(file_name)
+
+                self.draw_progress(1.0 - len(pending) / float(total))
+
+    def playable(self):
+        """ Call once the game is built and takes input. """
+
+        self.metrics["time_to_playable"] = self.elapsed()
+
+    def write_log(self, path):
+        """ Add this start's timings to a log, one JSON object per
+            line. """
+
+        entry = dict(self.metrics)
+        entry["date"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        entry["python"] = sys.version.split()[0]
+        entry["pygame"] = pygame.version.ver
+        with open(path, "a") as log_file:
+            log_file.write(json.dumps(entry, sort_keys=True) + "\n")
@@ -0,0 +1,62 @@
+"""
+Tests for the dirty-rectangle renderer: what reaches the display has to
+look exactly like a frame drawn in full.
+"""
+import hashlib
+
+import pygame
+import pytest
+
+import constants
+import headless
+
+
+def digest(surface):
+    """ Return a short hash of a surface's pixels. """
+
+    return hashlib.md5(pygame.image.tobytes(surface, "RGB")).hexdigest()
+
+
+def run_and_wait(game, frame):
+    """ Policy that runs right for a while and then stands still, so the
+        camera both moves and stays put. """
+
+    if frame % 120 < 60:
+        return headless.run_right(game, frame)
+    if game.player.change_x != 0:
+        return [pygame.event.Event(pygame.KEYUP, key=pygame.K_RIGHT)]
+    return []
+
+
+def stand_still(game, frame):
+    """ Policy that leaves the player where they start. """
+
+    return []
+
+
+@pytest.mark.parametrize("walk", [run_and_wait, stand_still])
+@pytest.mark.parametrize("level_no", [0, 1, 2])
+def test_updated_rects_match_full_frames(level_no, walk):
+    """ Copying only the rects the renderer returns gives the same frame
+        as drawing it in full, every frame. """
+
+    size = (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+    screen = pygame.Surface(size)
+    display = pygame.Surface(size)
+    full = pygame.Surface(size)
+    counts = {"partial": 0}
+
+    def policy(game, frame):
+        rects = game.renderer.draw(screen, game.current_level,
+                                   game.active_sprite_list,
+                                   game.draw_playing)
+        if rects != [screen.get_rect()]:
+            counts["partial"] += 1
+        for rect in rects:
+            display.blit(screen, rect, rect)
+        game.draw_playing(full)
+        assert digest(display) == digest(full), "frame %d" % frame
+        return walk(game, frame)
+
+    headless.run(policy, level_no, headless.FPS * 8)
+    assert counts["partial"] > 0
@@ -0,0 +1,95 @@
+"""
+Tests for the Gym-style environment: what reset() and step() hand back.
+"""
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+import env  # noqa: E402
+
+
+def test_reset_returns_an_observation():
+    """ reset() returns one float32 row laid out like
+        OBSERVATION_FIELDS. """
+
+    observation = env.TylerEnv().reset()
+    assert observation.dtype == numpy.float32
+    assert observation.shape == (env.OBSERVATION_SIZE,)
+    fields = dict(zip(env.OBSERVATION_FIELDS, observation))
+    assert fields["level"] == 0
+    assert fields["health"] == 100
+    assert fields["time"] == 100
+
+
+def test_step_contract():
+    """ step() returns (observation, reward, done, info) and the reward is
+        how far right the player got. """
+
+    tyler = env.TylerEnv()
+    observation = tyler.reset()
+    x = observation[env.OBSERVATION_FIELDS.index("x")]
+    for frame in range(1, 31):
+        observation, reward, done, info = tyler.step(env.RIGHT)
+        assert observation.shape == (env.OBSERVATION_SIZE,)
+        assert isinstance(reward, float)
+        assert done is False
+        assert info == {"frame": frame, "level": 0, "outcome": None}
+        new_x = observation[env.OBSERVATION_FIELDS.index("x")]
+        assert reward == new_x - x
+        x = new_x
+    assert x > 120
+
+
+def test_episode_ends_with_the_lose_reward():
+    """ Running out of time ends the episode with LOSE_REWARD. """
+
+    tyler = env.TylerEnv(fps=1)
+    tyler.reset()
+    for _ in range(200):
+        observation, reward, done, info = tyler.step(env.NOOP)
+        if done:
+            break
+    assert done
+    assert info["outcome"] == "lost"
+    assert reward == env.LOSE_REWARD
+
+
+def test_reset_starts_over():
+    """ A reset after an episode gives back the first observation. """
+
+    tyler = env.TylerEnv()
+    first = tyler.reset()
+    for _ in range(50):
+        tyler.step(env.RIGHT_JUMP)
+    assert (tyler.reset() == first).all()
+
+
+def test_environments_keep_their_own_session():
+    """ Environments taking turns in one process do not share time,
+        health or score. """
+
+    fast = env.TylerEnv(fps=1)
+    slow = env.TylerEnv()
+    fast.reset()
+    slow.reset()
+    for _ in range(10):
+        fast.step(env.NOOP)
+        slow.step(env.NOOP)
+    assert fast.session["TIME"] == 90
+    assert slow.session["TIME"] == 100
+
+
+def test_vector_env_batches():
+    """ VectorEnv returns one row per environment. """
+
+    envs = env.VectorEnv(3, workers=2)
+    try:
+        observations = envs.reset()
+        assert observations.shape == (3, env.OBSERVATION_SIZE)
+        observations, rewards, dones, infos = envs.step([env.RIGHT] * 3)
+        assert observations.shape == (3, env.OBSERVATION_SIZE)
+        assert rewards.shape == (3,)
+        assert dones.shape == (3,)
+        assert len(infos) == 3
+    finally:
+        envs.close()
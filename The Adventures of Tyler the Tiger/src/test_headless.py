@@ -0,0 +1,32 @@
+"""
+Tests for the headless runner.
+"""
+import constants
+import headless
+
+
+def test_run_reports_the_outcome():
+    """ A run that is cut short says so and reports where it stopped. """
+
+    result = headless.run(max_frames=headless.FPS)
+    assert result["outcome"] == "unfinished"
+    assert result["frames"] == headless.FPS
+    assert result["level"] == 0
+    assert result["x"] > 120
+
+
+def test_time_follows_simulated_frames():
+    """ The countdown ticks once every FPS frames, however fast the run
+        goes. """
+
+    headless.run(max_frames=headless.FPS * 3)
+    assert constants.TIME == 97
+
+
+def test_runs_are_repeatable():
+    """ The same policy plays the same game every time. """
+
+    first = headless.run()
+    second = headless.run()
+    assert first["outcome"] != "unfinished"
+    assert first == second
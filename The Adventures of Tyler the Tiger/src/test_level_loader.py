@@ -0,0 +1,53 @@
+"""
+Tests for the compiled level cache: it has to load the same level as the
+JSON file, and never a level written with another table of tile types.
+"""
+import os
+
+import bundle
+import level_loader
+
+
+def source(file_name):
+    """ Return the path of a level's JSON file. """
+
+    return bundle.path(level_loader.level_name(file_name))
+
+
+def rows(data):
+    """ Return everything a LevelData holds, for comparing. """
+
+    return (data.background, data.level_limit, list(data.tiles()),
+            list(data.mover_rows()))
+
+
+def test_cache_round_trip(tmp_path):
+    """ Every level reads back from its cache exactly as parsed. """
+
+    for file_name in level_loader.level_files():
+        data = level_loader.parse(source(file_name))
+        cached = str(tmp_path / "level.lvc")
+        level_loader.write_cache(data, cached)
+        assert rows(level_loader.read_cache(cached)) == rows(data)
+
+
+def test_changed_tile_table_is_refused(tmp_path, monkeypatch):
+    """ A cache written with another tile type table is not loaded. """
+
+    path = source(level_loader.level_files()[0])
+    cached = str(tmp_path / "level.lvc")
+    level_loader.write_cache(level_loader.parse(path), cached)
+    monkeypatch.setattr(level_loader, "TILE_TABLE",
+                        level_loader.TILE_TABLE + 1)
+    assert level_loader.read_cache(cached) is None
+
+
+def test_truncated_cache_is_refused(tmp_path):
+    """ A cut-off cache is not loaded. """
+
+    path = source(level_loader.level_files()[0])
+    cached = str(tmp_path / "level.lvc")
+    level_loader.write_cache(level_loader.parse(path), cached)
+    with open(cached, "r+b") as cache_file:
+        cache_file.truncate(os.path.getsize(cached) - 1)
+    assert level_loader.read_cache(cached) is None
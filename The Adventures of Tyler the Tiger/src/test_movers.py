@@ -0,0 +1,74 @@
+"""
+Tests for the NumPy mover engine: it has to move everything exactly like
+the sprites' own update() does.
+"""
+import pytest
+
+import constants
+import headless
+import movers
+
+pytestmark = pytest.mark.skipif(not movers.available(),
+                                reason="needs NumPy")
+
+# Frames to play on every level
+FRAMES = headless.FPS * 20
+
+
+def stand_still(game, frame):
+    """ Policy that leaves the player where they start, so the movers get
+        the whole run to move about. """
+
+    return []
+
+
+def play(level_no, vector_movers, walk):
+    """ Play a level with a policy and return where the player was on
+        every frame, and where every mover ended up. """
+
+    constants.VECTOR_MOVERS = vector_movers
+    headless.reset_constants()
+    trace = []
+    games = []
+
+    def policy(game, frame):
+        if not games:
+            games.append(game)
+        trace.append((game.current_level_no, game.player.rect.x,
+                      game.player.rect.y, constants.HEALTH))
+        return walk(game, frame)
+
+    headless.run(policy, level_no, FRAMES)
+    level = games[0].current_level
+    if level.mover_engine is not None:
+        level.mover_engine.sync()
+    positions = [(sprite.rect.topleft, sprite.change_x, sprite.change_y)
+                 for sprite in level.movers()]
+    return trace, positions
+
+
+@pytest.mark.parametrize("walk", [headless.run_right, stand_still])
+@pytest.mark.parametrize("level_no", [0, 1, 2])
+def test_engine_matches_sprite_updates(level_no, walk):
+    """ The player and every mover end up in the same place with the
+        engine as with a sprite update per mover. """
+
+    assert play(level_no, True, walk) == play(level_no, False, walk)
+
+
+def test_engine_is_used_when_on():
+    """ Levels only get an engine when VECTOR_MOVERS is on. """
+
+    games = []
+
+    def policy(game, frame):
+        games.append(game)
+        return []
+
+    constants.VECTOR_MOVERS = True
+    headless.run(policy, 2, 1)
+    assert games[0].current_level.mover_engine is not None
+
+    constants.VECTOR_MOVERS = False
+    headless.run(policy, 2, 1)
+    assert games[1].current_level.mover_engine is None
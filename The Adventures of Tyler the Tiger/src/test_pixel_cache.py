@@ -0,0 +1,113 @@
+"""
+Tests for the pixel cache: what goes in comes back out pixel for pixel,
+broken files are ignored and old files are deleted.
+"""
+import os
+
+import pygame
+import pytest
+
+import pixel_cache
+
+# The image the tests cache; any asset works, it only names the file
+IMAGE = "icon.png"
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """ Keep the tests' cache files out of the game's cache. """
+
+    monkeypatch.setattr(pixel_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(pixel_cache, "_hashes", {})
+    if pixel_cache.pixel_format() is None:
+        pytest.skip("the display's pixel format is not cached")
+    return tmp_path
+
+
+def make_image():
+    """ Return a small display-format image with a different colour in
+        every pixel. """
+
+    image = pygame.Surface((7, 5)).convert()
+    for x in range(7):
+        for y in range(5):
+            image.set_at((x, y), (x * 30, y * 50, x + y))
+    return image
+
+
+def pixels(image):
+    """ Return the RGB bytes of an image. """
+
+    return pygame.image.tobytes(image, "RGB")
+
+
+def cached_files(cache_dir):
+    """ Return the names of the files in the cache. """
+
+    return sorted(os.listdir(str(cache_dir)))
+
+
+def test_round_trip():
+    """ A saved image reads back with the same size and pixels. """
+
+    image = make_image()
+    pixel_cache.save(IMAGE, False, None, image)
+    cached = pixel_cache.read(IMAGE)
+    assert cached.get_size() == image.get_size()
+    assert pixels(cached) == pixels(image)
+
+
+def test_keys_are_kept_apart():
+    """ The same file with another alpha or background is another
+        entry. """
+
+    pixel_cache.save(IMAGE, False, None, make_image())
+    assert pixel_cache.read(IMAGE, True) is None
+    assert pixel_cache.read(IMAGE, False, (0, 0, 0)) is None
+
+
+def test_broken_files_are_ignored(cache_dir):
+    """ A truncated file is a miss, not a broken image. """
+
+    pixel_cache.save(IMAGE, False, None, make_image())
+    path = pixel_cache.cache_path(IMAGE)
+    with open(path, "r+b") as raw_file:
+        raw_file.truncate(os.path.getsize(path) - 1)
+    assert pixel_cache.read(IMAGE) is None
+
+
+def test_new_version_replaces_the_old(cache_dir):
+    """ Saving an edited image deletes the file of the old version. """
+
+    pixel_cache._hashes[IMAGE] = "1" * 40
+    pixel_cache.save(IMAGE, False, None, make_image())
+    old = cached_files(cache_dir)
+    pixel_cache._hashes[IMAGE] = "2" * 40
+    pixel_cache.save(IMAGE, False, None, make_image())
+    new = cached_files(cache_dir)
+    assert len(old) == len(new) == 1
+    assert old != new
+
+
+def test_cache_stays_under_the_limit(cache_dir, monkeypatch):
+    """ The least recently used files go once the cache is full, and
+        never the one just written. """
+
+    image = make_image()
+    size = pixel_cache.HEADER.size + 7 * 5 * 4
+    monkeypatch.setattr(pixel_cache, "CACHE_LIMIT", size * 2)
+    names = ["a.png", "b.png", "c.png"]
+    for name in names:
+        pixel_cache._hashes[name] = name[0] * 40
+    pixel_cache.save("a.png", False, None, image)
+    pixel_cache.save("b.png", False, None, image)
+
+    # b.png was used long ago; reading a.png marks it as just used
+    os.utime(pixel_cache.cache_path("b.png"), (0, 0))
+    assert pixel_cache.read("a.png") is not None
+    pixel_cache.save("c.png", False, None, image)
+
+    assert len(cached_files(cache_dir)) == 2
+    assert pixel_cache.read("b.png") is None
+    assert pixel_cache.read("a.png") is not None
+    assert pixel_cache.read("c.png") is not None
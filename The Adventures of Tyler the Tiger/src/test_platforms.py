@@ -0,0 +1,111 @@
+"""
+Tests for merging static tiles into collision spans: the spans have to
+cover exactly the tiles, and the game has to play the same with them.
+"""
+import pygame
+import pytest
+
+import constants
+import headless
+import levels
+import platforms
+from player import Player
+
+
+def spans(*rects):
+    """ Return the rects of the spans some tile rects merge into. """
+
+    return [span.rect for span in platforms.merge_tiles(
+        [pygame.Rect(rect) for rect in rects])]
+
+
+def test_tiles_side_by_side_merge():
+    """ Tiles that touch at the same height become one span. """
+
+    assert spans((0, 10, 70, 40), (70, 10, 70, 40), (140, 10, 70, 40)) == [
+        pygame.Rect(0, 10, 210, 40)]
+
+
+def test_overlapping_tiles_merge():
+    """ Overlapping tiles merge without the span growing past them. """
+
+    assert spans((0, 0, 70, 40), (35, 0, 70, 40)) == [
+        pygame.Rect(0, 0, 105, 40)]
+
+
+def test_gaps_and_heights_keep_tiles_apart():
+    """ A gap, another top or another height starts a new span. """
+
+    assert spans((0, 0, 70, 40), (71, 0, 70, 40)) == [
+        pygame.Rect(0, 0, 70, 40), pygame.Rect(71, 0, 70, 40)]
+    assert spans((0, 0, 70, 40), (70, 1, 70, 40)) == [
+        pygame.Rect(0, 0, 70, 40), pygame.Rect(70, 1, 70, 40)]
+    assert spans((0, 0, 70, 40), (70, 0, 70, 70)) == [
+        pygame.Rect(0, 0, 70, 40), pygame.Rect(70, 0, 70, 70)]
+
+
+def test_spans_keep_the_order_of_their_first_tile():
+    """ Spans come back in the order their first tile was added, however
+        the tiles were ordered. """
+
+    assert spans((500, 0, 70, 40), (0, 100, 70, 40), (70, 100, 70, 40),
+                 (430, 0, 70, 40)) == [
+        pygame.Rect(430, 0, 140, 40), pygame.Rect(0, 100, 140, 40)]
+
+
+def test_spans_cover_the_tiles():
+    """ Every tile of every level lies inside exactly one span. """
+
+    player = Player()
+    for level_class in (levels.Level_01, levels.Level_02, levels.Level_03):
+        level = level_class(player)
+        rects = level.tiles.rects()
+        merged = [span.rect for span in platforms.merge_tiles(rects)]
+        assert len(merged) < len(rects)
+        for rect in rects:
+            assert len([span for span in merged
+                        if span.contains(rect)]) == 1
+
+
+def unmerged_tiles(self):
+    """ Level.merge_tiles as it was before spans: one shape per tile. """
+
+    for rect in self.tiles.rects():
+        self.platform_index.insert(platforms.Span(rect))
+
+
+def trace(level_no, walk):
+    """ Play a level and return where the player was on every frame. """
+
+    headless.reset_constants()
+    frames = []
+
+    def policy(game, frame):
+        frames.append((game.current_level_no, game.player.rect.x,
+                       game.player.rect.y, game.player.change_y,
+                       constants.HEALTH))
+        return walk(game, frame)
+
+    result = headless.run(policy, level_no, headless.FPS * 20)
+    return frames, result
+
+
+def run_left(game, frame):
+    """ Policy that runs right for a while, then back left, jumping. """
+
+    key = pygame.K_RIGHT if frame < 200 else pygame.K_LEFT
+    events = [pygame.event.Event(pygame.KEYDOWN, key=key)]
+    if frame % 25 == 0:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP))
+    return events
+
+
+@pytest.mark.parametrize("walk", [headless.run_right, run_left])
+@pytest.mark.parametrize("level_no", [0, 1, 2])
+def test_spans_play_like_tiles(monkeypatch, level_no, walk):
+    """ The player moves exactly the same on the spans as on the tiles
+        they were merged from. """
+
+    merged = trace(level_no, walk)
+    monkeypatch.setattr(levels.Level, "merge_tiles", unmerged_tiles)
+    assert trace(level_no, walk) == merged
@@ -0,0 +1,98 @@
+"""
+Tests for recording and replaying input: a recording has to play back the
+same game, frame for frame, every time.
+"""
+import pygame
+import pytest
+
+import replay
+
+
+def script(frame):
+    """ The input of a short game: start, run right, jump now and then,
+        turn round, with a countdown tick every second. """
+
+    events = []
+    if frame == 2:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    if frame % 60 == 0:
+        events.append(pygame.event.Event(pygame.USEREVENT))
+    if frame % 7 == 3:
+        key = pygame.K_RIGHT if frame < 400 else pygame.K_LEFT
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+    if frame % 45 == 10:
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_UP))
+    if frame % 45 == 30:
+        events.append(pygame.event.Event(pygame.KEYUP, key=pygame.K_UP))
+    if frame % 90 == 50:
+        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                         pos=(10, 10)))
+    return events
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """ Record the scripted game and return the file. """
+
+    path = str(tmp_path / "game.rec")
+    recorder = replay.InputRecorder(path)
+    for frame in range(1, 601):
+        recorder.record(frame, script(frame))
+    recorder.record(601, [pygame.event.Event(pygame.QUIT)])
+    recorder.close()
+    return path
+
+
+def test_events_round_trip():
+    """ Every kind of recorded event comes back as it went in. """
+
+    events = [
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT),
+        pygame.event.Event(pygame.KEYUP, key=pygame.K_UP),
+        pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=3, pos=(40, 7)),
+        pygame.event.Event(pygame.USEREVENT),
+        pygame.event.Event(pygame.QUIT),
+    ]
+    for event in events:
+        frame, back = replay.unpack(replay.pack(12, event))
+        assert frame == 12
+        assert back.type == event.type
+        assert back.dict == event.dict
+
+
+def test_other_events_are_not_recorded():
+    """ Events the game does not react to are left out. """
+
+    assert replay.pack(1, pygame.event.Event(pygame.MOUSEMOTION)) is None
+
+
+def test_recording_hands_back_its_frames(recording):
+    """ The replay hands out each frame's events in order. """
+
+    player = replay.InputReplay(recording)
+    for frame in range(1, 601):
+        got = [(event.type, event.dict) for event in player.events(frame)]
+        assert got == [(event.type, event.dict)
+                       for event in script(frame)]
+    assert [event.type for event in player.events(601)] == [pygame.QUIT]
+    assert player.finished
+
+
+def test_replay_is_deterministic(recording, tmp_path):
+    """ Two replays of one recording leave identical traces. """
+
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    result = replay.run(recording, str(first))
+    assert replay.run(recording, str(second)) == result
+    assert first.read_text() == second.read_text()
+    assert len(first.read_text().splitlines()) > 0
+
+
+def test_other_files_are_refused(tmp_path):
+    """ A file that is not a recording is not played. """
+
+    path = tmp_path / "not.rec"
+    path.write_bytes(b"PNG!\x01\x00")
+    with pytest.raises(ValueError):
+        replay.InputReplay(str(path))
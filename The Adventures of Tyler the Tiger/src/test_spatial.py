@@ -0,0 +1,59 @@
+"""
+Tests for the spatial hash: it has to find what a full scan finds, and its
+query counts have to measure collision work only.
+"""
+import random
+
+import pygame
+
+import constants
+import levels
+from player import Player
+from spatial import SpatialHash
+
+
+class Box(object):
+    """ The least a sprite needs to go in the hash. """
+
+    def __init__(self, rect):
+        """ Constructor. Pass in the rect. """
+
+        self.rect = rect
+
+
+def test_collide_matches_a_full_scan():
+    """ collide() returns what checking every sprite returns, in the
+        order they were inserted, also after sprites moved. """
+
+    rng = random.Random(1)
+    boxes = [Box(pygame.Rect(rng.randrange(2000), rng.randrange(600),
+                             rng.randrange(1, 200), rng.randrange(1, 200)))
+             for _ in range(300)]
+    grid = SpatialHash()
+    for box in boxes:
+        grid.insert(box)
+    for box in boxes[::3]:
+        box.rect.move_ip(rng.randrange(-300, 300), rng.randrange(-100, 100))
+        grid.update(box)
+
+    for _ in range(200):
+        rect = pygame.Rect(rng.randrange(-100, 2100), rng.randrange(600),
+                           rng.randrange(1, 300), rng.randrange(1, 300))
+        assert grid.collide(rect) == [
+            box for box in boxes if rect.colliderect(box.rect)]
+
+
+def test_drawing_is_not_counted():
+    """ Drawing a level leaves the collision query counts alone. """
+
+    player = Player()
+    level = levels.Level_03(player)
+    player.level = level
+    screen = pygame.Surface([constants.SCREEN_WIDTH,
+                             constants.SCREEN_HEIGHT])
+    index = level.platform_index
+    counts = (index.queries, index.candidates)
+    for offset in range(0, -3000, -250):
+        level.camera.offset_x = offset
+        level.draw(screen)
+    assert (index.queries, index.candidates) == counts